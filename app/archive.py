@@ -0,0 +1,72 @@
+"""Archival of past bookings.
+
+Bookings that ended more than `retention_days` ago can never conflict
+with a new request, so they are moved from the hot `bookings` table to
+`archived_bookings` and evicted from the scheduler's memory. Schedule
+and history queries reaching before the archive watermark read them
+back from the archive.
+
+Usage:
+    python -m app.archive --db booking_system.db --retention-days 90
+"""
+import argparse
+import threading
+from datetime import datetime, timedelta
+
+from app.scheduler import Scheduler
+
+DEFAULT_RETENTION_DAYS = 90
+
+
+class Archiver:
+    """Periodically archives bookings older than the retention period."""
+
+    def __init__(self, scheduler: Scheduler, retention_days: int = DEFAULT_RETENTION_DAYS):
+        self.scheduler = scheduler
+        self.retention_days = retention_days
+        self._stop = threading.Event()
+        self._thread = None
+
+    def cutoff(self) -> datetime:
+        """Bookings ending before this date are archived."""
+        return datetime.now() - timedelta(days=self.retention_days)
+
+    def run_once(self) -> int:
+        """Archive everything older than the cutoff now."""
+        return self.scheduler.archive_bookings_before(self.cutoff())
+
+    def start(self, interval_seconds: float = 3600):
+        """Run the archival in a background thread every `interval_seconds`."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    print(f"Error: archival failed: {e}")
+                self._stop.wait(interval_seconds)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, name="booking-archiver", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive past bookings")
+    parser.add_argument("--db", default="booking_system.db")
+    parser.add_argument("--retention-days", type=int, default=DEFAULT_RETENTION_DAYS)
+    args = parser.parse_args()
+
+    archiver = Archiver(Scheduler(args.db), args.retention_days)
+    archived = archiver.run_once()
+    print(f"{archived} booking(s) archived (cutoff {archiver.cutoff():%Y-%m-%d %H:%M})")
+
+
+if __name__ == "__main__":
+    main()
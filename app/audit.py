@@ -0,0 +1,119 @@
+"""Audit of overlapping bookings.
+
+Overlaps can exist in databases written before bookings were serialised
+through the scheduler lock and the group-commit writer. Instead of
+comparing every pair of bookings, the audit reads each room's bookings
+in start order (from a covering index) and sweeps them while keeping
+the still-running bookings in a heap ordered by end date: every booking
+conflicts exactly with the active bookings left once those ending
+before its start are popped. That is O(n log n + k) for n bookings and
+k conflicting pairs, and reads the table as a stream.
+
+Repair keeps the booking that was made first (lowest ID) and drops any
+booking overlapping a kept one.
+
+Usage:
+    python -m app.audit --db booking_system.db
+    python -m app.audit --db booking_system.db --repair
+"""
+import argparse
+import heapq
+import json
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Set
+
+from app.database import Database
+
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def find_conflicts(db_path: str, room_ids: List[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+    """Every pair of overlapping bookings of a database, room by room."""
+    query = 'SELECT id, room_id, start_date, end_date FROM bookings'
+    params = []
+    if room_ids:
+        query += f' WHERE room_id IN ({", ".join("?" * len(room_ids))})'
+        params += room_ids
+    query += ' ORDER BY room_id, start_date'
+
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    try:
+        cursor = conn.execute(query, params)
+        room_id = None
+        # (end_date, id, start_date) of the bookings running at the sweep position.
+        # Dates are compared as the ISO-8601 text Database stores, without parsing.
+        active = []
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for booking_id, booking_room_id, start_date, end_date in rows:
+                if booking_room_id != room_id:
+                    room_id = booking_room_id
+                    active = []
+                while active and active[0][0] <= start_date:
+                    heapq.heappop(active)
+                for other_end, other_id, other_start in active:
+                    yield {
+                        "room_id": room_id,
+                        "booking_id": other_id,
+                        "conflicting_booking_id": booking_id,
+                        "overlap_start": start_date,
+                        "overlap_end": min(end_date, other_end)
+                    }
+                heapq.heappush(active, (end_date, booking_id, start_date))
+    finally:
+        conn.close()
+
+
+def bookings_to_drop(conflicts: Iterable[dict]) -> List[int]:
+    """Bookings to delete so no overlap remains, keeping the earliest-made ones.
+
+    Only bookings involved in a conflict are considered: going through
+    them by increasing ID, a booking is kept unless it overlaps one
+    already kept.
+    """
+    neighbours: Dict[int, Set[int]] = {}
+    for conflict in conflicts:
+        a, b = conflict["booking_id"], conflict["conflicting_booking_id"]
+        neighbours.setdefault(a, set()).add(b)
+        neighbours.setdefault(b, set()).add(a)
+
+    kept = set()
+    dropped = []
+    for booking_id in sorted(neighbours):
+        if neighbours[booking_id] & kept:
+            dropped.append(booking_id)
+        else:
+            kept.add(booking_id)
+    return dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find (and optionally remove) overlapping bookings")
+    parser.add_argument("--db", action="append",
+                        help="database file, repeat for sharded deployments (default booking_system.db)")
+    parser.add_argument("--room-id", type=int, action="append")
+    parser.add_argument("--repair", action="store_true",
+                        help="delete the later booking of each conflict (stop the API first, "
+                             "or use POST /audit/repair)")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args()
+
+    for db_path in args.db or ["booking_system.db"]:
+        conflicts = []
+        for conflict in find_conflicts(db_path, args.room_id):
+            conflicts.append(conflict)
+            if not args.quiet:
+                print(json.dumps(conflict))
+        print(f"✓ {db_path}: {len(conflicts)} conflicting pairs")
+
+        if args.repair and conflicts:
+            dropped = bookings_to_drop(conflicts)
+            Database(db_path).delete_bookings(dropped)
+            print(f"✓ {db_path}: {len(dropped)} bookings removed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+
+class AvailabilityCache:
+    """Bounded LRU of availability answers, validated against per-room versions.
+
+    Every change to what a room can accept (booking written or removed,
+    pending write, hold) bumps the room's version, taken from a single
+    logical clock. An entry records the version of each room its answer
+    depends on and is served only while none of them has moved, so a
+    booking in one room leaves the cached answers about other rooms
+    intact. Changes to the set of rooms invalidate everything.
+
+    Callers read `stamp()` before computing an answer and pass it to
+    `put`: if a dependency changed in the meantime the answer may be
+    stale and is not stored.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._versions: Dict[int, int] = {}
+        self._clock = 0
+        # Entries stamped before this clock value are all stale
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stamp(self) -> int:
+        """Current clock value, to pass to `put`."""
+        return self._clock
+
+    def bump(self, room_id: int):
+        """Invalidate the answers depending on a room."""
+        with self._lock:
+            self._clock += 1
+            self._versions[room_id] = self._clock
+
+    def invalidate_all(self):
+        """Invalidate every answer (rooms added, bookings reloaded)."""
+        with self._lock:
+            self._clock += 1
+            self._epoch = self._clock
+            self._entries.clear()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached answer, or None if missing or stale."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stamp, tags, value = entry
+                if stamp >= self._epoch and all(self._versions.get(room_id, 0) == version
+                                                for room_id, version in tags):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any, room_ids: Iterable[int], stamp: int):
+        """Store an answer computed from the state at `stamp`, depending on `room_ids`."""
+        with self._lock:
+            if stamp < self._epoch:
+                return
+            tags = tuple((room_id, self._versions.get(room_id, 0)) for room_id in room_ids)
+            if any(version > stamp for _, version in tags):
+                return
+            self._entries[key] = (stamp, tags, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
@@ -1,18 +1,31 @@
 import sqlite3
 import json
+import threading
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from app.models import Room, Event, Booking
+from app.search import SearchIndex
 
 
 class Database:
     """Handles all database operations for the booking system."""
     
-    def __init__(self, db_path: str = "booking_system.db"):
+    def __init__(self, db_path: str = "booking_system.db", id_offset: int = 0):
         self.db_path = db_path
-        self.conn = None
+        # IDs generated by this database start after id_offset (see app.sharding)
+        self.id_offset = id_offset
+        # API requests run in a thread pool: each thread gets its own connection
+        self._local = threading.local()
         self.initialize_database()
     
+    @property
+    def conn(self):
+        return getattr(self._local, "conn", None)
+    
+    @conn.setter
+    def conn(self, conn):
+        self._local.conn = conn
+    
     def connect(self):
         """Establish database connection."""
         self.conn = sqlite3.connect(self.db_path)
@@ -23,6 +36,7 @@ class Database:
         """Close database connection."""
         if self.conn:
             self.conn.close()
+            self.conn = None
     
     def initialize_database(self):
         """Create tables if they don't exist."""
@@ -35,10 +49,16 @@ class Database:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 name TEXT NOT NULL,
                 capacity INTEGER NOT NULL,
-                equipments TEXT NOT NULL
+                equipments TEXT NOT NULL,
+                site TEXT NOT NULL DEFAULT 'main'
             )
         ''')
         
+        # Add the site column to databases created before it existed
+        columns = [row['name'] for row in cursor.execute('PRAGMA table_info(rooms)')]
+        if 'site' not in columns:
+            cursor.execute("ALTER TABLE rooms ADD COLUMN site TEXT NOT NULL DEFAULT 'main'")
+        
         # Create events table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS events (
@@ -62,6 +82,42 @@ class Database:
             )
         ''')
         
+        # Covering index: the conflict audit (app.audit) sweeps bookings room by room in start order
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_bookings_room_start
+            ON bookings (room_id, start_date, end_date)
+        ''')
+        
+        # Create archive of past bookings, moved out of the hot table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS archived_bookings (
+                id INTEGER PRIMARY KEY,
+                room_id INTEGER NOT NULL,
+                event_id INTEGER NOT NULL,
+                start_date TEXT NOT NULL,
+                end_date TEXT NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_archived_bookings_room_start
+            ON archived_bookings (room_id, start_date)
+        ''')
+        
+        # Start AUTOINCREMENT sequences at the offset so IDs never collide across shards
+        if self.id_offset:
+            for table in ('rooms', 'events', 'bookings'):
+                cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table,))
+                row = cursor.fetchone()
+                if row is None:
+                    cursor.execute('INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)',
+                                   (table, self.id_offset))
+                elif row['seq'] < self.id_offset:
+                    cursor.execute('UPDATE sqlite_sequence SET seq = ? WHERE name = ?',
+                                   (self.id_offset, table))
+        
+        # Create full-text index over room and event names
+        SearchIndex.create(cursor)
+        
         conn.commit()
         self.close()
     
@@ -71,13 +127,35 @@ class Database:
         cursor = conn.cursor()
         
         cursor.execute('''
-            INSERT OR REPLACE INTO rooms (name, capacity, equipments)
-            VALUES (?, ?, ?)
-        ''', (room.name, room.capacity, json.dumps(room.equipments)))
+            INSERT OR REPLACE INTO rooms (name, capacity, equipments, site)
+            VALUES (?, ?, ?, ?)
+        ''', (room.name, room.capacity, json.dumps(room.equipments), room.site))
         
+        room.id = cursor.lastrowid
+        SearchIndex.index(cursor, 'room', room.id, room.name, room.equipments)
         conn.commit()
         self.close()
     
+    def save_rooms(self, rooms: List[Room]):
+        """Save a batch of rooms in a single transaction, setting their IDs."""
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        try:
+            for room in rooms:
+                cursor.execute('''
+                    INSERT INTO rooms (name, capacity, equipments, site)
+                    VALUES (?, ?, ?, ?)
+                ''', (room.name, room.capacity, json.dumps(room.equipments), room.site))
+                room.id = cursor.lastrowid
+                SearchIndex.index(cursor, 'room', room.id, room.name, room.equipments)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.close()
+    
     def save_event(self, event: Event):
         """Save or update an event in the database."""
         conn = self.connect()
@@ -88,6 +166,8 @@ class Database:
             VALUES (?, ?, ?)
         ''', (event.name, event.attendees, json.dumps(event.required_equipments)))
         
+        event.id = cursor.lastrowid
+        SearchIndex.index(cursor, 'event', event.id, event.name, event.required_equipments)
         conn.commit()
         self.close()
     
@@ -97,9 +177,9 @@ class Database:
         cursor = conn.cursor()
         
         cursor.execute('''
-            INSERT INTO bookings ( event_id, start_date, end_date)
-            VALUES ( ?, ?, ?)
-        ''', (booking.event_id, 
+            INSERT INTO bookings (room_id, event_id, start_date, end_date)
+            VALUES (?, ?, ?, ?)
+        ''', (booking.room_id, booking.event_id, 
               booking.start_date.isoformat(), booking.end_date.isoformat()))
         
         booking_id = cursor.lastrowid
@@ -108,6 +188,44 @@ class Database:
         
         return booking_id
     
+    def save_events_and_bookings(self, pairs: List[Tuple[Event, Booking]]):
+        """Save events and their bookings in a single transaction, setting their IDs."""
+        self.apply_booking_changes([], pairs)
+    
+    def apply_booking_changes(self, removed_ids: List[int],
+                              pairs: List[Tuple[Optional[Event], Booking]]):
+        """Delete and insert bookings in a single transaction, setting the new IDs.
+        
+        A pair without an event keeps the booking's existing event_id.
+        """
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.executemany('DELETE FROM bookings WHERE id = ?', [(i,) for i in removed_ids])
+            for event, booking in pairs:
+                if event is not None:
+                    cursor.execute('''
+                        INSERT INTO events (name, attendees, required_equipments)
+                        VALUES (?, ?, ?)
+                    ''', (event.name, event.attendees, json.dumps(event.required_equipments)))
+                    event.id = cursor.lastrowid
+                    SearchIndex.index(cursor, 'event', event.id, event.name, event.required_equipments)
+                    booking.event_id = event.id
+                
+                cursor.execute('''
+                    INSERT INTO bookings (room_id, event_id, start_date, end_date)
+                    VALUES (?, ?, ?, ?)
+                ''', (booking.room_id, booking.event_id,
+                      booking.start_date.isoformat(), booking.end_date.isoformat()))
+                booking.id = cursor.lastrowid
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.close()
+    
     def get_all_rooms(self) -> List[Room]:
         """Retrieve all rooms from the database."""
         conn = self.connect()
@@ -122,7 +240,8 @@ class Database:
                 row['id'],
                 row['name'],
                 row['capacity'],
-                json.loads(row['equipments'])
+                json.loads(row['equipments']),
+                row['site']
             ))
         
         self.close()
@@ -182,6 +301,19 @@ class Database:
         
         return deleted
     
+    def delete_bookings(self, booking_ids: List[int]) -> int:
+        """Delete a batch of bookings in a single transaction."""
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        cursor.executemany('DELETE FROM bookings WHERE id = ?', [(i,) for i in booking_ids])
+        deleted = cursor.rowcount
+        
+        conn.commit()
+        self.close()
+        
+        return deleted
+    
     def get_room_by_id(self, room_id: int) -> Optional[Room]:
         """Get a specific room by ID."""
         conn = self.connect()
@@ -194,7 +326,7 @@ class Database:
         
         if row:
             return Room(row['id'], row['name'], row['capacity'], 
-                       json.loads(row['equipments']))
+                       json.loads(row['equipments']), row['site'])
         return None
     
     def get_event_by_id(self, event_id: int) -> Optional[Event]:
@@ -210,4 +342,93 @@ class Database:
         if row:
             return Event(row['id'], row['name'], row['attendees'],
                         json.loads(row['required_equipments']))
-        return None
\ No newline at end of file
+        return None
+    
+    def search(self, query: str, kind: str = None, limit: int = 20,
+               offset: int = 0, ranking: str = "bm25") -> List[dict]:
+        """Search rooms and events by name or equipment prefix."""
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        results = SearchIndex.search(cursor, query, kind, limit, offset, ranking)
+        
+        self.close()
+        return results
+    
+    def archive_bookings(self, booking_ids: List[int]) -> int:
+        """Move a batch of bookings to the archive in a single transaction."""
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        params = [(i,) for i in booking_ids]
+        cursor.executemany('''
+            INSERT INTO archived_bookings (id, room_id, event_id, start_date, end_date)
+            SELECT id, room_id, event_id, start_date, end_date
+            FROM bookings WHERE id = ?
+        ''', params)
+        cursor.executemany('DELETE FROM bookings WHERE id = ?', params)
+        archived = cursor.rowcount
+        
+        conn.commit()
+        self.close()
+        
+        return archived
+    
+    def get_archive_watermark(self) -> Optional[datetime]:
+        """Latest end date in the archive: no archived booking reaches past it."""
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT MAX(end_date) AS watermark FROM archived_bookings')
+        row = cursor.fetchone()
+        
+        self.close()
+        
+        if row['watermark']:
+            return datetime.fromisoformat(row['watermark'])
+        return None
+    
+    def get_archived_bookings(self, room_id: int = None, start_date: datetime = None,
+                              end_date: datetime = None) -> List[Booking]:
+        """Retrieve archived bookings, optionally for one room and overlapping a period."""
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        query = 'SELECT * FROM archived_bookings WHERE 1 = 1'
+        params = []
+        if room_id is not None:
+            query += ' AND room_id = ?'
+            params.append(room_id)
+        if start_date:
+            query += ' AND end_date > ?'
+            params.append(start_date.isoformat())
+        if end_date:
+            query += ' AND start_date < ?'
+            params.append(end_date.isoformat())
+        
+        cursor.execute(query + ' ORDER BY start_date', params)
+        rows = cursor.fetchall()
+        
+        bookings = [Booking(row['id'], row['room_id'], row['event_id'],
+                            datetime.fromisoformat(row['start_date']),
+                            datetime.fromisoformat(row['end_date']))
+                    for row in rows]
+        
+        self.close()
+        return bookings
+    
+    def get_archived_booking(self, booking_id: int) -> Optional[Booking]:
+        """Get a specific archived booking by ID."""
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM archived_bookings WHERE id = ?', (booking_id,))
+        row = cursor.fetchone()
+        
+        self.close()
+        
+        if row:
+            return Booking(row['id'], row['room_id'], row['event_id'],
+                           datetime.fromisoformat(row['start_date']),
+                           datetime.fromisoformat(row['end_date']))
+        return None
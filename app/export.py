@@ -0,0 +1,180 @@
+"""Columnar export of bookings and rooms as Arrow IPC streams or Parquet files.
+
+Rows are read from SQLite cursors in chunks and turned into Arrow record
+batches column by column, so memory stays bounded by the chunk size
+whatever the number of exported rows.
+
+Usage:
+    python -m app.export bookings -o bookings.parquet --start 2025-01-01 --room-id 3
+    python -m app.export rooms -o rooms.arrow --format arrow
+"""
+import argparse
+import json
+import sqlite3
+from datetime import datetime
+from typing import Iterable, Iterator, List
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DEFAULT_CHUNK_SIZE = 65536
+
+BOOKING_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("room_id", pa.int64()),
+    ("event_id", pa.int64()),
+    ("event_name", pa.string()),
+    ("attendees", pa.int64()),
+    ("start_date", pa.timestamp("us")),
+    ("end_date", pa.timestamp("us")),
+    ("archived", pa.bool_()),
+])
+
+ROOM_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("name", pa.string()),
+    ("capacity", pa.int64()),
+    ("equipments", pa.list_(pa.string())),
+    ("site", pa.string()),
+])
+
+# End-of-stream marker of the Arrow IPC streaming format
+_IPC_EOS = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    # Batches may be consumed from another thread than the one that opened the cursor
+    return sqlite3.connect(db_path, check_same_thread=False)
+
+
+def _to_batch(rows: List[tuple], schema: pa.Schema) -> pa.RecordBatch:
+    """Build a record batch from a chunk of rows, one Arrow array per column."""
+    columns = list(zip(*rows))
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_timestamp(field.type):
+            # ISO-8601 text as stored by Database: parsed by Arrow in one vectorised cast
+            arrays.append(pa.array(values, pa.string()).cast(field.type))
+        elif pa.types.is_boolean(field.type):
+            # SQLite has no boolean type: 0/1 integers
+            arrays.append(pa.array(values, pa.int8()).cast(field.type))
+        elif pa.types.is_list(field.type):
+            arrays.append(pa.array([json.loads(v) for v in values], field.type))
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _batches(db_path: str, query: str, params: list, schema: pa.Schema,
+             chunk_size: int) -> Iterator[pa.RecordBatch]:
+    conn = _connect(db_path)
+    try:
+        cursor = conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield _to_batch(rows, schema)
+    finally:
+        conn.close()
+
+
+def booking_batches(db_paths: Iterable[str], start_date: datetime = None,
+                    end_date: datetime = None, room_ids: List[int] = None,
+                    include_archived: bool = False,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pa.RecordBatch]:
+    """Record batches of the bookings overlapping [start_date, end_date), optionally per room."""
+    tables = [("bookings", False)] + ([("archived_bookings", True)] if include_archived else [])
+    for db_path in db_paths:
+        for table, archived in tables:
+            query = f'''
+                SELECT b.id, b.room_id, b.event_id, e.name, e.attendees,
+                       b.start_date, b.end_date, {int(archived)}
+                FROM {table} b LEFT JOIN events e ON e.id = b.event_id
+                WHERE 1 = 1
+            '''
+            params = []
+            if start_date:
+                query += ' AND b.end_date > ?'
+                params.append(start_date.isoformat())
+            if end_date:
+                query += ' AND b.start_date < ?'
+                params.append(end_date.isoformat())
+            if room_ids:
+                query += f' AND b.room_id IN ({", ".join("?" * len(room_ids))})'
+                params += room_ids
+            yield from _batches(db_path, query, params, BOOKING_SCHEMA, chunk_size)
+
+
+def room_batches(db_paths: Iterable[str], room_ids: List[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pa.RecordBatch]:
+    """Record batches of the rooms."""
+    query = 'SELECT id, name, capacity, equipments, site FROM rooms'
+    params = []
+    if room_ids:
+        query += f' WHERE id IN ({", ".join("?" * len(room_ids))})'
+        params += room_ids
+    for db_path in db_paths:
+        yield from _batches(db_path, query, params, ROOM_SCHEMA, chunk_size)
+
+
+def ipc_stream(batches: Iterable[pa.RecordBatch], schema: pa.Schema) -> Iterator[bytes]:
+    """Encode batches as an Arrow IPC stream, one message at a time."""
+    yield schema.serialize().to_pybytes()
+    for batch in batches:
+        yield batch.serialize().to_pybytes()
+    yield _IPC_EOS
+
+
+def write_parquet(batches: Iterable[pa.RecordBatch], schema: pa.Schema, path: str) -> int:
+    """Write batches to a Parquet file, one row group per batch. Returns the row count."""
+    rows = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def write_arrow(batches: Iterable[pa.RecordBatch], schema: pa.Schema, path: str) -> int:
+    """Write batches to an Arrow IPC stream file. Returns the row count."""
+    rows = 0
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_stream(sink, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export bookings or rooms to Parquet / Arrow")
+    parser.add_argument("table", choices=["bookings", "rooms"])
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--format", choices=["parquet", "arrow"],
+                        help="defaults to the output file extension, else parquet")
+    parser.add_argument("--db", action="append",
+                        help="database file, repeat for sharded deployments (default booking_system.db)")
+    parser.add_argument("--start", type=datetime.fromisoformat)
+    parser.add_argument("--end", type=datetime.fromisoformat)
+    parser.add_argument("--room-id", type=int, action="append")
+    parser.add_argument("--include-archived", action="store_true")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    db_paths = args.db or ["booking_system.db"]
+    if args.table == "bookings":
+        schema = BOOKING_SCHEMA
+        batches = booking_batches(db_paths, args.start, args.end, args.room_id,
+                                  args.include_archived, args.chunk_size)
+    else:
+        schema = ROOM_SCHEMA
+        batches = room_batches(db_paths, args.room_id, args.chunk_size)
+
+    export_format = args.format or ("arrow" if args.output.endswith((".arrow", ".arrows")) else "parquet")
+    write = write_arrow if export_format == "arrow" else write_parquet
+    rows = write(batches, schema, args.output)
+    print(f"{rows} {args.table} exported to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
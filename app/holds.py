@@ -0,0 +1,148 @@
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, List, Optional
+
+DEFAULT_HOLD_TTL = 300
+MAX_HOLD_TTL = 3600
+
+# How long confirmed, released or expired holds stay readable before they are forgotten
+RESOLVED_RETENTION_SECONDS = 600
+
+
+class Hold:
+    """A tentative reservation blocking a room interval until it expires or is confirmed."""
+
+    ACTIVE = "active"
+    CONFIRMED = "confirmed"
+    RELEASED = "released"
+    EXPIRED = "expired"
+
+    def __init__(self, id: int, room_id: int, event_name: str, attendees: int,
+                 required_equipments: List[str], start_date: datetime, end_date: datetime,
+                 expires_at: datetime):
+        self.id = id
+        self.room_id = room_id
+        self.event_name = event_name
+        self.attendees = attendees
+        self.required_equipments = required_equipments
+        self.start_date = start_date
+        self.end_date = end_date
+        self.expires_at = expires_at
+        self.status = self.ACTIVE
+        self.booking_id = None
+
+        if start_date >= end_date:
+            raise ValueError("Start date must be before end date")
+
+    def is_active(self, now: datetime = None) -> bool:
+        """Whether the hold still blocks its interval (and can be confirmed)."""
+        return self.status == self.ACTIVE and (now or datetime.now()) < self.expires_at
+
+    def __repr__(self):
+        return (f"Hold(id={self.id}, room_id={self.room_id}, start_date={self.start_date}, "
+                f"end_date={self.end_date}, expires_at={self.expires_at}, status='{self.status}')")
+
+
+class TimingWheel:
+    """Hashed timing wheel: O(1) scheduling and cancellation of timeouts.
+
+    Time is cut into ticks of `tick` seconds mapped onto a ring of `size`
+    slots. A timeout lands in the slot it expires in, with the number of
+    full turns of the ring left before it is due; advancing one tick only
+    looks at the next slot, so expiry never scans every pending timeout.
+    """
+
+    def __init__(self, tick: float = 1.0, size: int = 512):
+        self.tick = tick
+        self.size = size
+        self._slots: List[Dict[Hashable, int]] = [{} for _ in range(size)]
+        self._slot_of: Dict[Hashable, int] = {}
+        self._cursor = 0
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    def schedule(self, key: Hashable, delay: float):
+        """Fire `key` after `delay` seconds (rounded up to whole ticks)."""
+        self.cancel(key)
+        ticks = max(1, math.ceil(delay / self.tick))
+        slot = (self._cursor + ticks) % self.size
+        self._slots[slot][key] = (ticks - 1) // self.size
+        self._slot_of[key] = slot
+
+    def cancel(self, key: Hashable):
+        """Forget a scheduled key, if any."""
+        slot = self._slot_of.pop(key, None)
+        if slot is not None:
+            del self._slots[slot][key]
+
+    def advance(self) -> List[Hashable]:
+        """Move one tick forward and return the keys that are now due."""
+        self._cursor = (self._cursor + 1) % self.size
+        slot = self._slots[self._cursor]
+        due = []
+        for key, rounds in list(slot.items()):
+            if rounds:
+                slot[key] = rounds - 1
+            else:
+                due.append(key)
+                del slot[key]
+                del self._slot_of[key]
+        return due
+
+
+class HoldTable:
+    """Active holds indexed per room, with their expiry on a timing wheel.
+
+    Once resolved, a hold stays readable for `RESOLVED_RETENTION_SECONDS`
+    (on the same wheel) and is then forgotten.
+
+    Callers are expected to hold the scheduler lock and to call `advance`
+    once per wheel tick.
+    """
+
+    def __init__(self, first_id: int = 1, tick: float = 1.0):
+        self.holds: Dict[int, Hold] = {}
+        self._by_room: Dict[int, Dict[int, Hold]] = {}
+        self.wheel = TimingWheel(tick)
+        self._next_id = first_id
+
+    def add(self, room_id: int, event_name: str, attendees: int,
+            required_equipments: List[str], start_date: datetime, end_date: datetime,
+            ttl_seconds: float) -> Hold:
+        """Place a new hold expiring in `ttl_seconds`."""
+        hold = Hold(self._next_id, room_id, event_name, attendees, required_equipments,
+                    start_date, end_date, datetime.now() + timedelta(seconds=ttl_seconds))
+        self._next_id += 1
+        self.holds[hold.id] = hold
+        self._by_room.setdefault(room_id, {})[hold.id] = hold
+        self.wheel.schedule(hold.id, ttl_seconds)
+        return hold
+
+    def get(self, hold_id: int) -> Optional[Hold]:
+        """Find a hold by its ID, whatever its state."""
+        return self.holds.get(hold_id)
+
+    def room_holds(self, room_id: int) -> List[Hold]:
+        """Holds of a room still blocking their interval."""
+        return list(self._by_room.get(room_id, {}).values())
+
+    def remove(self, hold: Hold, status: str, booking_id: int = None):
+        """Take a hold out of the index and move it to a final state."""
+        self._by_room.get(hold.room_id, {}).pop(hold.id, None)
+        hold.status = status
+        hold.booking_id = booking_id
+        # Its timeout now means forgetting the hold
+        self.wheel.schedule(hold.id, RESOLVED_RETENTION_SECONDS)
+
+    def advance(self) -> List[Hold]:
+        """Advance the wheel one tick, expire the holds that are due and forget old ones."""
+        expired = []
+        for hold_id in self.wheel.advance():
+            hold = self.holds[hold_id]
+            if hold.status == Hold.ACTIVE:
+                self.remove(hold, Hold.EXPIRED)
+                expired.append(hold)
+            else:
+                del self.holds[hold_id]
+        return expired
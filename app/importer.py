@@ -0,0 +1,252 @@
+"""Streaming bulk import of rooms and bookings from CSV or Parquet files.
+
+Files are read in chunks (CSV rows or Parquet record batches). Each chunk
+is parsed, validated against the scheduler's in-memory indexes (room
+capacity and equipment, overlaps with existing bookings and with rows
+accepted earlier in the file) and written in a single transaction, so
+memory stays bounded by the chunk size whatever the file size.
+
+Expected columns:
+    rooms:    name, capacity, equipments, site (optional, default "main")
+    bookings: room_id, event_name, attendees, required_equipments (optional),
+              start_date, end_date
+
+Dates are ISO-8601; those carrying a UTC offset are converted to naive
+local time, like every date the scheduler stores.
+
+List columns are JSON arrays (`["Projector", "Whiteboard"]`), plain
+`;`-separated strings, or Arrow lists in Parquet files.
+
+Usage:
+    python -m app.importer rooms rooms.csv
+    python -m app.importer bookings bookings.parquet --db booking_system.db --rejects rejects.csv
+"""
+import argparse
+import csv
+import io
+import json
+from datetime import datetime
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+import pyarrow.parquet as pq
+
+from app.models import Room
+from app.schemas import naive_local
+
+DEFAULT_CHUNK_SIZE = 5000
+MAX_REPORTED_REJECTS = 100
+FORMATS = ("csv", "parquet")
+
+
+def format_for(filename: str) -> str:
+    """Import format inferred from a file name, csv by default."""
+    return "parquet" if filename.lower().endswith((".parquet", ".pq")) else "csv"
+
+
+def read_chunks(source: BinaryIO, file_format: str,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[dict]]:
+    """Rows of a CSV or Parquet file as dicts, `chunk_size` at a time."""
+    if file_format == "parquet":
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+        return
+
+    reader = csv.DictReader(io.TextIOWrapper(source, encoding="utf-8-sig", newline=""))
+    chunk = []
+    for row in reader:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _required(row: dict, column: str):
+    value = row.get(column)
+    if value is None or value == "":
+        raise ValueError(f"Missing {column}")
+    return value
+
+
+def _int(row: dict, column: str) -> int:
+    value = _required(row, column)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {column}: {value!r}")
+
+
+def _datetime(row: dict, column: str) -> datetime:
+    value = _required(row, column)
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid {column}: {value!r}")
+    return naive_local(value)
+
+
+def _string_list(row: dict, column: str) -> List[str]:
+    value = row.get(column)
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        if value.lstrip().startswith("["):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                raise ValueError(f"Invalid {column}: {value!r}")
+        else:
+            value = value.split(";")
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+def parse_room(row: dict) -> Room:
+    """Room described by an import row (its ID is assigned on save)."""
+    capacity = _int(row, "capacity")
+    if capacity <= 0:
+        raise ValueError("Capacity must be positive")
+    return Room(0, str(_required(row, "name")), capacity, _string_list(row, "equipments"),
+                row.get("site") or "main")
+
+
+def parse_booking(row: dict) -> dict:
+    """Booking request described by an import row, as expected by `Scheduler.import_bookings`."""
+    attendees = _int(row, "attendees")
+    if attendees <= 0:
+        raise ValueError("Attendees must be positive")
+    start_date = _datetime(row, "start_date")
+    end_date = _datetime(row, "end_date")
+    if start_date >= end_date:
+        raise ValueError("Start date must be before end date")
+    return {
+        "room_id": _int(row, "room_id"),
+        "event_name": str(_required(row, "event_name")),
+        "attendees": attendees,
+        "required_equipments": _string_list(row, "required_equipments"),
+        "start_date": start_date,
+        "end_date": end_date
+    }
+
+
+class ImportReport:
+    """Running totals of an import; keeps the first rejects for display."""
+
+    def __init__(self, max_rejects: int = MAX_REPORTED_REJECTS, rejects_file=None):
+        self.rows = 0
+        self.imported = 0
+        self.rejected = 0
+        self.rejects: List[Tuple[int, str]] = []
+        # Why the import stopped early, if it did (rows counted so far are already saved)
+        self.error: Optional[str] = None
+        self.max_rejects = max_rejects
+        self._rejects_writer = csv.writer(rejects_file) if rejects_file else None
+        if self._rejects_writer:
+            self._rejects_writer.writerow(["row", "reason"])
+
+    def reject(self, row: int, reason: str):
+        self.rejected += 1
+        if len(self.rejects) < self.max_rejects:
+            self.rejects.append((row, reason))
+        if self._rejects_writer:
+            self._rejects_writer.writerow([row, reason])
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "imported": self.imported,
+            "rejected": self.rejected,
+            "rejects": [{"row": row, "reason": reason} for row, reason in self.rejects],
+            "error": self.error
+        }
+
+
+def import_rooms(scheduler, chunks: Iterator[List[dict]], report: ImportReport = None) -> ImportReport:
+    """Import room rows, one transaction per chunk."""
+    report = report or ImportReport()
+    for chunk in chunks:
+        rooms = []
+        rows = []
+        rejects = []
+        for row in chunk:
+            report.rows += 1
+            try:
+                rooms.append(parse_room(row))
+            except ValueError as e:
+                rejects.append((report.rows, str(e)))
+                continue
+            rows.append(report.rows)
+        if rooms:
+            scheduler_rejects = scheduler.import_rooms(rooms, rows)
+            report.imported += len(rooms) - len(scheduler_rejects)
+            rejects += scheduler_rejects
+        for row, reason in sorted(rejects):
+            report.reject(row, reason)
+    return report
+
+
+def import_bookings(scheduler, chunks: Iterator[List[dict]], report: ImportReport = None) -> ImportReport:
+    """Import booking rows, one transaction per chunk."""
+    report = report or ImportReport()
+    for chunk in chunks:
+        requests = []
+        rejects = []
+        for row in chunk:
+            report.rows += 1
+            try:
+                request = parse_booking(row)
+            except ValueError as e:
+                rejects.append((report.rows, str(e)))
+                continue
+            request["row"] = report.rows
+            requests.append(request)
+        if requests:
+            scheduler_rejects = scheduler.import_bookings(requests)
+            report.imported += len(requests) - len(scheduler_rejects)
+            rejects += scheduler_rejects
+        for row, reason in sorted(rejects):
+            report.reject(row, reason)
+    return report
+
+
+IMPORTERS = {"rooms": import_rooms, "bookings": import_bookings}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import rooms or bookings from CSV / Parquet")
+    parser.add_argument("table", choices=list(IMPORTERS))
+    parser.add_argument("input")
+    parser.add_argument("--format", choices=FORMATS,
+                        help="defaults to the input file extension, else csv")
+    parser.add_argument("--db", default="booking_system.db")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--rejects", help="write every rejected row to this CSV file")
+    args = parser.parse_args()
+
+    from app.scheduler import Scheduler
+
+    scheduler = Scheduler(args.db)
+    rejects_file = open(args.rejects, "w", newline="") if args.rejects else None
+    report = ImportReport(rejects_file=rejects_file)
+    try:
+        with open(args.input, "rb") as source:
+            chunks = read_chunks(source, args.format or format_for(args.input), args.chunk_size)
+            IMPORTERS[args.table](scheduler, chunks, report)
+    except (ValueError, KeyError, UnicodeDecodeError) as e:
+        report.error = f"Invalid {args.table} file: {e}"
+    finally:
+        scheduler.writer.close()
+        if rejects_file:
+            rejects_file.close()
+
+    print(f"✓ {report.imported}/{report.rows} {args.table} imported, {report.rejected} rejected")
+    for row, reason in report.rejects:
+        print(f"  row {row}: {reason}")
+    if report.error:
+        print(f"Error: {report.error} (rows after {report.rows} were not read)")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
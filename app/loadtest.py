@@ -0,0 +1,291 @@
+"""Load generator for the booking API.
+
+Starts ``app.main:app`` under uvicorn against a temporary SQLite file,
+seeds it with rooms and bookings, then drives a weighted mix of requests
+at a fixed concurrency and prints a JSON report.
+
+Usage:
+    python -m app.loadtest --rooms 100 --bookings 2000 --concurrency 32 \\
+        --duration 30 --mix check=4,book=2,rooms=1,schedule=3
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.database import Database
+
+EQUIPMENTS = ["projector", "whiteboard", "tv", "videoconference", "wifi", "computer"]
+OPERATIONS = ["check", "book", "rooms", "schedule", "schedules"]
+DEFAULT_MIX = "check=4,book=2,rooms=1,schedule=3"
+
+
+class Workload:
+    """Generates random but realistic request payloads."""
+
+    def __init__(self, rooms: int, horizon_days: int, seed: int):
+        self.rooms = rooms
+        self.horizon_days = horizon_days
+        self.rng = random.Random(seed)
+        self.room_specs = {}
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.origin = today + timedelta(days=1)
+
+    def room_row(self, index: int) -> tuple:
+        """Row for the rooms table."""
+        capacity = self.rng.choice([10, 20, 30, 40, 60, 80, 120, 200, 300])
+        equipments = self.rng.sample(EQUIPMENTS, self.rng.randint(0, 3))
+        self.room_specs[index + 1] = (capacity, equipments)
+        return (f"Room {index + 1}", capacity, json.dumps(equipments))
+
+    def slot(self) -> tuple:
+        """Random 1-3 hour slot during opening hours within the horizon."""
+        day = self.origin + timedelta(days=self.rng.randrange(self.horizon_days))
+        start = day + timedelta(hours=self.rng.randint(8, 18))
+        end = start + timedelta(hours=self.rng.randint(1, 3))
+        return start, end
+
+    def room_id(self) -> int:
+        return self.rng.randint(1, self.rooms)
+
+    def event(self) -> dict:
+        return {
+            "event_name": f"Event {self.rng.randrange(10**6)}",
+            "attendees": self.rng.randint(5, 150),
+            "required_equipments": self.rng.sample(EQUIPMENTS, self.rng.randint(0, 2))
+        }
+
+    def fitting_event(self, room_id: int) -> dict:
+        """Event the given room is suitable for, so a refusal means a time conflict."""
+        capacity, equipments = self.room_specs[room_id]
+        return {
+            "event_name": f"Event {self.rng.randrange(10**6)}",
+            "attendees": self.rng.randint(1, capacity),
+            "required_equipments": self.rng.sample(equipments, self.rng.randint(0, len(equipments)))
+        }
+
+
+def seed_database(db_path: str, workload: Workload, bookings: int):
+    """Insert rooms, events and bookings directly, bypassing the API."""
+    db = Database(db_path)
+    conn = db.connect()
+    conn.executemany('INSERT INTO rooms (name, capacity, equipments) VALUES (?, ?, ?)',
+                     [workload.room_row(i) for i in range(workload.rooms)])
+
+    taken = {}
+    event_rows, booking_rows = [], []
+    for _ in range(bookings):
+        room_id = workload.room_id()
+        start, end = workload.slot()
+        slots = taken.setdefault(room_id, [])
+        if any(start < e and end > s for s, e in slots):
+            continue
+        slots.append((start, end))
+        event_id = len(event_rows) + 1
+        event_rows.append((f"Seed event {event_id}", 1, "[]"))
+        booking_rows.append((room_id, event_id, start.isoformat(), end.isoformat()))
+
+    conn.executemany('INSERT INTO events (name, attendees, required_equipments) VALUES (?, ?, ?)',
+                     event_rows)
+    conn.executemany('INSERT INTO bookings (room_id, event_id, start_date, end_date) VALUES (?, ?, ?, ?)',
+                     booking_rows)
+    conn.commit()
+    db.close()
+    return len(booking_rows)
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """Parse 'check=4,book=1' into a weight per operation."""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}', expected one of {OPERATIONS}")
+        weights[name] = int(weight or 1)
+    return weights
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(db_path: str, port: int) -> subprocess.Popen:
+    """Launch uvicorn in a subprocess and wait until /health answers."""
+    env = dict(os.environ, BOOKING_DB_PATH=db_path)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return process
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30s")
+
+
+async def request(client: httpx.AsyncClient, op: str, workload: Workload) -> int:
+    """Send one request of the given operation and return its status code."""
+    if op == "check":
+        start, end = workload.slot()
+        payload = dict(workload.event(), start_date=start.isoformat(), end_date=end.isoformat())
+        response = await client.post("/availability/check", json=payload)
+    elif op == "book":
+        start, end = workload.slot()
+        room_id = workload.room_id()
+        payload = dict(workload.fitting_event(room_id), room_id=room_id,
+                       start_date=start.isoformat(), end_date=end.isoformat())
+        response = await client.post("/bookings", json=payload)
+    elif op == "rooms":
+        response = await client.get("/rooms")
+    elif op == "schedule":
+        response = await client.get(f"/rooms/{workload.room_id()}/schedule")
+    else:
+        start, _ = workload.slot()
+        response = await client.get("/schedules", params={
+            "start_date": start.replace(hour=0).isoformat(),
+            "end_date": (start.replace(hour=0) + timedelta(days=7)).isoformat()
+        })
+    return response.status_code
+
+
+async def drive(base_url: str, weights: Dict[str, int], workload: Workload,
+                concurrency: int, duration: float) -> Dict[str, list]:
+    """Run the request mix for `duration` seconds and collect samples per operation."""
+    samples = {op: [] for op in weights}
+    ops, op_weights = list(weights), list(weights.values())
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker():
+            while time.perf_counter() < deadline:
+                op = workload.rng.choices(ops, op_weights)[0]
+                started = time.perf_counter()
+                try:
+                    status = await request(client, op, workload)
+                except httpx.HTTPError:
+                    status = 0
+                samples[op].append((time.perf_counter() - started, status))
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+def percentile(sorted_values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(samples: list, elapsed: float, conflict_status: Optional[int]) -> dict:
+    """Throughput, latency percentiles (ms) and error/conflict rates of a sample list."""
+    latencies = sorted(latency * 1000 for latency, _ in samples)
+    count = len(samples)
+    conflicts = sum(1 for _, status in samples if status == conflict_status)
+    errors = sum(1 for _, status in samples
+                 if status != conflict_status and not 200 <= status < 300)
+    return {
+        "requests": count,
+        "throughput_rps": count / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "mean": sum(latencies) / count if count else None,
+            "p50": percentile(latencies, 50),
+            "p90": percentile(latencies, 90),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else None
+        },
+        "errors": errors,
+        "error_rate": errors / count if count else 0.0,
+        "conflicts": conflicts,
+        "conflict_rate": conflicts / count if count else 0.0
+    }
+
+
+def run(args) -> dict:
+    """Seed a temporary database, start the server, drive the load and build the report."""
+    weights = parse_mix(args.mix)
+    workload = Workload(args.rooms, args.horizon_days, args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "loadtest.db")
+        seeded = seed_database(db_path, workload, args.bookings)
+        port = args.port or free_port()
+        server = start_server(db_path, port)
+        try:
+            started = time.perf_counter()
+            samples = asyncio.run(drive(f"http://127.0.0.1:{port}", weights, workload,
+                                        args.concurrency, args.duration))
+            elapsed = time.perf_counter() - started
+        finally:
+            server.terminate()
+            server.wait()
+
+    # A refused POST /bookings (400) is a slot conflict, not a server error
+    operations = {op: summarize(op_samples, elapsed, 400 if op == "book" else None)
+                  for op, op_samples in samples.items()}
+    overall = summarize([s for op_samples in samples.values() for s in op_samples], elapsed, None)
+    overall["conflicts"] = sum(o["conflicts"] for o in operations.values())
+    overall["errors"] -= overall["conflicts"]
+    overall["conflict_rate"] = overall["conflicts"] / overall["requests"] if overall["requests"] else 0.0
+    overall["error_rate"] = overall["errors"] / overall["requests"] if overall["requests"] else 0.0
+
+    return {
+        "config": {
+            "rooms": args.rooms,
+            "seeded_bookings": seeded,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "mix": weights
+        },
+        "elapsed_s": elapsed,
+        "overall": overall,
+        "operations": operations
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the booking API")
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--bookings", type=int, default=2000, help="bookings to seed")
+    parser.add_argument("--horizon-days", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help=f"weighted operations among {', '.join(OPERATIONS)}")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,31 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, File, HTTPException, Query, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 
-from datetime import datetime
-from typing import List
-from app.schemas import AvailabilityCheck, BookingResponse, RoomCreate, RoomResponse, BookingCreate
-from app.scheduler import Scheduler
+import asyncio
+import itertools
+import os
+import orjson
+import tempfile
+from datetime import datetime, timedelta
+from typing import Annotated, List, Optional
+from app.schemas import AvailabilityCheck, AvailabilityResponse, BookingResponse, RoomCreate, RoomResponse, BookingCreate, RoomScheduleResponse, WaitlistResponse, SearchResponse, ImportResponse, HoldCreate, HoldResponse, ScenarioCreate, ScenarioResponse, BookingMove, ScenarioDiffResponse, ScenarioCommitResponse, LocalDatetime
+from app.scheduler import DEFAULT_HOLD_TTL, ROOM_ORDERS, Scheduler
+from app.sharding import ShardRouter
+from app.archive import Archiver, DEFAULT_RETENTION_DAYS
 from app.models import Room, Event, Booking
+from app.waitlist import WaitlistEntry
+from app.holds import Hold
+from app.scenarios import Scenario, ScenarioManager
+from app.search import KINDS
+from app.importer import FORMATS, IMPORTERS, ImportReport, format_for, read_chunks
+from app.audit import bookings_to_drop, find_conflicts
+from app.occupancy import occupancy_matrix, to_arrow, to_json
+from app.export import BOOKING_SCHEMA, ROOM_SCHEMA, booking_batches, ipc_stream, room_batches, write_parquet
+from app.serializers import (booking_to_dict, encode_booking, encode_list, encode_room,
+                             encode_schedule, json_response)
 
 app = FastAPI(title="Booking System API", version="1.0.0")
 
@@ -18,8 +38,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialiser le scheduler
-scheduler = Scheduler("booking_system.db")
+# Initialiser le scheduler: un seul processus, ou un processus par site si BOOKING_SHARDS
+# est défini (ex. "nord,sud"), chaque site ayant son propre fichier SQLite. Une base existante
+# doit d'abord être répartie par site: python -m app.sharding --db booking_system.db --sites nord,sud
+db_path = os.environ.get("BOOKING_DB_PATH", "booking_system.db")
+if os.environ.get("BOOKING_SHARDS"):
+    scheduler = ShardRouter([s.strip() for s in os.environ["BOOKING_SHARDS"].split(",") if s.strip()],
+                            db_path)
+else:
+    scheduler = Scheduler(db_path)
+
+# Scénarios "what-if" en mémoire (non disponibles en mode multi-sites)
+scenarios = ScenarioManager(scheduler) if isinstance(scheduler, Scheduler) else None
+
+# Archivage périodique des réservations passées, activé par BOOKING_RETENTION_DAYS
+archiver = Archiver(scheduler, int(os.environ.get("BOOKING_RETENTION_DAYS", DEFAULT_RETENTION_DAYS)))
+if "BOOKING_RETENTION_DAYS" in os.environ:
+    archiver.start(float(os.environ.get("BOOKING_ARCHIVE_INTERVAL", 3600)))
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+# Intervalle entre deux lectures d'une demande en attente pendant un long-poll
+WAITLIST_POLL_SECONDS = 0.2
 
 # ==================== Room Endpoints ====================
 
@@ -27,33 +66,19 @@ scheduler = Scheduler("booking_system.db")
 def create_room(room: RoomCreate):
     """Créer une nouvelle salle"""
     try:
-        new_room = Room(0, room.name, room.capacity, room.equipments)
+        new_room = Room(0, room.name, room.capacity, room.equipments, room.site)
         scheduler.add_room(new_room)
         
         # new_room.id contient maintenant l'ID généré
-        return {
-            "id": new_room.id,
-            "name": new_room.name,
-            "capacity": new_room.capacity,
-            "equipments": new_room.equipments
-        }
+        return json_response(encode_room(new_room), status_code=201)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/rooms", response_model=List[RoomResponse])
 def get_all_rooms():
     """Récupérer toutes les salles"""
-    rooms = scheduler.db.get_all_rooms()
-    print(rooms)
-    return [
-        {
-            "id": r.id,
-            "name": r.name,
-            "capacity": r.capacity,
-            "equipments": r.equipments
-        }
-        for r in rooms
-    ]
+    rooms = scheduler.get_all_rooms()
+    return json_response(encode_list(rooms, encode_room))
 
 @app.get("/rooms/{room_id}", response_model=RoomResponse)
 def get_room(room_id: int):
@@ -61,12 +86,7 @@ def get_room(room_id: int):
     room = scheduler.get_room_by_id(room_id)
     if not room:
         raise HTTPException(status_code=404, detail=f"Room {room_id} not found")
-    return {
-        "id": room.id,
-        "name": room.name,
-        "capacity": room.capacity,
-        "equipments": room.equipments
-    }
+    return json_response(encode_room(room))
 
 @app.delete("/rooms/{room_id}", status_code=204)
 def delete_room(room_id: int):
@@ -90,32 +110,17 @@ def create_booking(booking: BookingCreate):
             start_date=booking.start_date,
             end_date=booking.end_date
         )
-        return {
-            "id": new_booking.id,
-            "room_id": new_booking.room_id,
-            "event_id": new_booking.event_id,
-            "start_date": new_booking.start_date,
-            "end_date": new_booking.end_date,
-            "duration_hours": new_booking.duration_hours
-        }
+        if new_booking is None:
+            raise ValueError("Booking could not be created: room not found, unsuitable or not available")
+        return json_response(encode_booking(new_booking), status_code=201)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/bookings", response_model=List[BookingResponse])
-def get_all_bookings():
-    """Récupérer toutes les réservations"""
-    bookings = scheduler.get_all_bookings()
-    return [
-        {
-            "id": b.id,
-            "room_id": b.room_id,
-            "event_id": b.event_id,
-            "start_date": b.start_date,
-            "end_date": b.end_date,
-            "duration_hours": b.duration_hours
-        }
-        for b in bookings
-    ]
+def get_all_bookings(include_archived: bool = False):
+    """Récupérer toutes les réservations (include_archived pour inclure les réservations archivées)"""
+    bookings = scheduler.get_all_bookings(include_archived)
+    return json_response(encode_list(bookings, encode_booking))
 
 @app.get("/bookings/{booking_id}", response_model=BookingResponse)
 def get_booking(booking_id: int):
@@ -123,14 +128,7 @@ def get_booking(booking_id: int):
     booking = scheduler.get_booking(booking_id)
     if not booking:
         raise HTTPException(status_code=404, detail=f"Booking {booking_id} not found")
-    return {
-        "id": booking.id,
-        "room_id": booking.room_id,
-        "event_id": booking.event_id,
-        "start_date": booking.start_date,
-        "end_date": booking.end_date,
-        "duration_hours": booking.duration_hours
-    }
+    return json_response(encode_booking(booking))
 
 @app.delete("/bookings/{booking_id}", status_code=204)
 def cancel_booking(booking_id: int):
@@ -139,26 +137,27 @@ def cancel_booking(booking_id: int):
         raise HTTPException(status_code=404, detail=f"Booking {booking_id} not found")
 
 @app.get("/rooms/{room_id}/bookings", response_model=List[BookingResponse])
-def get_room_bookings(room_id: int):
+def get_room_bookings(room_id: int, include_archived: bool = False):
     """Récupérer toutes les réservations d'une salle"""
-    bookings = scheduler.get_room_bookings(room_id)
-    return [
-        {
-            "id": b.id,
-            "room_id": b.room_id,
-            "event_id": b.event_id,
-            "start_date": b.start_date,
-            "end_date": b.end_date,
-            "duration_hours": b.duration_hours
-        }
-        for b in bookings
-    ]
+    bookings = scheduler.get_room_bookings(room_id, include_archived)
+    return json_response(encode_list(bookings, encode_booking))
 
 # ==================== Availability Endpoints ====================
 
-@app.post("/availability/check")
-def check_availability(availability: AvailabilityCheck):
-    """Vérifier les salles disponibles pour un événement"""
+@app.post("/availability/check", response_model=AvailabilityResponse)
+def check_availability(
+    availability: AvailabilityCheck,
+    limit: Optional[int] = Query(None, ge=1),
+    order: str = Query("id", pattern=f"^({'|'.join(ROOM_ORDERS)})$"),
+    exclude_hold_id: Optional[int] = Query(None)
+):
+    """Vérifier les salles disponibles pour un événement
+    
+    order=best_fit classe les salles de la plus petite à la plus grande capacité suffisante,
+    limit arrête la recherche dès que ce nombre de salles libres est trouvé.
+    exclude_hold_id ignore la réservation provisoire de l'appelant, pour que la salle
+    qu'il a retenue reste dans la liste.
+    """
     event = Event(
         id=0,  # Temporaire
         name=availability.event_name,
@@ -169,30 +168,25 @@ def check_availability(availability: AvailabilityCheck):
     available_rooms = scheduler.find_available_rooms(
         event,
         availability.start_date,
-        availability.end_date
+        availability.end_date,
+        limit,
+        order,
+        exclude_hold_id
     )
     
-    return {
-        "available": len(available_rooms) > 0,
-        "rooms": [
-            {
-                "id": r.id,
-                "name": r.name,
-                "capacity": r.capacity,
-                "equipments": r.equipments
-            }
-            for r in available_rooms
-        ]
-    }
+    available = b"true" if available_rooms else b"false"
+    return json_response(b'{"available":' + available +
+                         b',"rooms":' + encode_list(available_rooms, encode_room) + b"}")
 
 @app.get("/rooms/{room_id}/availability")
 def check_room_availability(
     room_id: int,
-    start_date: datetime = Query(...),
-    end_date: datetime = Query(...)
+    # Forme Annotated: avec "= Query(...)" le validateur de LocalDatetime serait ignoré
+    start_date: Annotated[LocalDatetime, Query()],
+    end_date: Annotated[LocalDatetime, Query()]
 ):
     """Vérifier si une salle est disponible pour une période donnée"""
-    is_available = scheduler.is_room_available(room_id, start_date, end_date)
+    is_available = scheduler.check_room_availability(room_id, start_date, end_date)
     return {
         "room_id": room_id,
         "start_date": start_date,
@@ -202,7 +196,7 @@ def check_room_availability(
 
 # ==================== Schedule Endpoints ====================
 
-@app.get("/rooms/{room_id}/schedule")
+@app.get("/rooms/{room_id}/schedule", response_model=RoomScheduleResponse)
 def get_room_schedule(room_id: int):
     """Récupérer le planning d'une salle"""
     bookings = scheduler.get_room_schedule(room_id)
@@ -211,23 +205,444 @@ def get_room_schedule(room_id: int):
     if not room:
         raise HTTPException(status_code=404, detail=f"Room {room_id} not found")
     
+    return json_response(encode_schedule(room, bookings))
+
+@app.get("/schedules", response_model=List[RoomScheduleResponse])
+def get_rooms_schedule(
+    room_ids: Optional[List[int]] = Query(None),
+    start_date: Annotated[Optional[LocalDatetime], Query()] = None,
+    end_date: Annotated[Optional[LocalDatetime], Query()] = None,
+    stream: bool = False
+):
+    """Récupérer en une seule requête le planning de toutes les salles (ou d'une sélection)"""
+    schedules = scheduler.get_rooms_schedule(room_ids, start_date, end_date)
+    
+    if stream:
+        # Une ligne JSON par salle (NDJSON) pour un rendu progressif côté client
+        lines = (encode_schedule(room, bookings) + b"\n" for room, bookings in schedules)
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+    
+    return json_response(encode_list(schedules, lambda entry: encode_schedule(*entry)))
+
+@app.get("/occupancy")
+def get_occupancy(
+    start_date: Annotated[LocalDatetime, Query()],
+    end_date: Annotated[LocalDatetime, Query()],
+    bin_minutes: int = Query(60, ge=1),
+    room_ids: Optional[List[int]] = Query(None),
+    include_archived: bool = False,
+    format: str = Query("json", pattern="^(json|arrow|raw)$")
+):
+    """Matrice d'occupation salles x créneaux (pourcentage 0-100 de chaque créneau réservé)
+    
+    format=json: listes par salle; format=arrow: flux IPC Arrow (room_id, room_name, occupancy);
+    format=raw: octets uint8 ligne par ligne, salles triées par ID, dimensions dans X-Occupancy-Shape.
+    """
+    try:
+        rooms, matrix = occupancy_matrix(scheduler.db_paths, start_date, end_date, bin_minutes,
+                                         room_ids, include_archived)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if format == "arrow":
+        return Response(to_arrow(rooms, matrix, start_date, bin_minutes),
+                        media_type=ARROW_STREAM_MEDIA_TYPE)
+    if format == "raw":
+        return Response(matrix.tobytes(), media_type="application/octet-stream", headers={
+            "X-Occupancy-Shape": f"{matrix.shape[0]},{matrix.shape[1]}",
+            "X-Occupancy-Start": start_date.isoformat(),
+            "X-Occupancy-Bin-Minutes": str(bin_minutes)
+        })
+    return Response(to_json(rooms, matrix, start_date, bin_minutes), media_type="application/json")
+
+# ==================== Waitlist Endpoints ====================
+
+@app.post("/waitlist", response_model=WaitlistResponse, status_code=201)
+def join_waitlist(booking: BookingCreate):
+    """Mettre une demande de réservation en liste d'attente (réservée tout de suite si la salle est libre)"""
+    try:
+        entry = scheduler.join_waitlist(
+            room_id=booking.room_id,
+            event_name=booking.event_name,
+            attendees=booking.attendees,
+            required_equipments=booking.required_equipments,
+            start_date=booking.start_date,
+            end_date=booking.end_date
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return waitlist_entry(entry)
+
+@app.get("/waitlist/{entry_id}", response_model=WaitlistResponse)
+async def get_waitlist_entry(entry_id: int, wait: float = Query(0, ge=0, le=60)):
+    """Consulter une demande en attente; avec wait > 0, attendre jusqu'à `wait` secondes qu'elle soit résolue"""
+    # L'attente se fait dans la boucle asyncio: aucun thread (ni worker de shard) n'est bloqué
+    deadline = asyncio.get_running_loop().time() + wait
+    entry = await run_in_threadpool(scheduler.get_waitlist_entry, entry_id)
+    while entry and entry.status == WaitlistEntry.WAITING:
+        remaining = deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            break
+        await asyncio.sleep(min(WAITLIST_POLL_SECONDS, remaining))
+        entry = await run_in_threadpool(scheduler.get_waitlist_entry, entry_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail=f"Waitlist entry {entry_id} not found")
+    return waitlist_entry(entry)
+
+@app.delete("/waitlist/{entry_id}", status_code=204)
+def leave_waitlist(entry_id: int):
+    """Retirer une demande de la liste d'attente"""
+    if not scheduler.leave_waitlist(entry_id):
+        raise HTTPException(status_code=404, detail=f"Waiting entry {entry_id} not found")
+
+@app.get("/rooms/{room_id}/waitlist", response_model=List[WaitlistResponse])
+def get_room_waitlist(room_id: int):
+    """Récupérer la liste d'attente d'une salle"""
+    return [waitlist_entry(e) for e in scheduler.get_room_waitlist(room_id)]
+
+def waitlist_entry(entry: WaitlistEntry) -> dict:
+    """Construire la réponse d'une demande en attente"""
+    return {
+        "id": entry.id,
+        "room_id": entry.room_id,
+        "event_name": entry.event_name,
+        "attendees": entry.attendees,
+        "required_equipments": entry.required_equipments,
+        "start_date": entry.start_date,
+        "end_date": entry.end_date,
+        "status": entry.status,
+        "booking_id": entry.booking_id
+    }
+
+# ==================== Hold Endpoints ====================
+
+@app.post("/holds", response_model=HoldResponse, status_code=201)
+def place_hold(hold: HoldCreate):
+    """Bloquer provisoirement une salle pendant ttl_seconds, le temps de confirmer la réservation"""
+    try:
+        new_hold = scheduler.place_hold(
+            room_id=hold.room_id,
+            event_name=hold.event_name,
+            attendees=hold.attendees,
+            required_equipments=hold.required_equipments,
+            start_date=hold.start_date,
+            end_date=hold.end_date,
+            ttl_seconds=DEFAULT_HOLD_TTL if hold.ttl_seconds is None else hold.ttl_seconds
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return hold_response(new_hold)
+
+@app.get("/holds/{hold_id}", response_model=HoldResponse)
+def get_hold(hold_id: int):
+    """Consulter une réservation provisoire"""
+    hold = scheduler.get_hold(hold_id)
+    if not hold:
+        raise HTTPException(status_code=404, detail=f"Hold {hold_id} not found")
+    return hold_response(hold)
+
+@app.post("/holds/{hold_id}/confirm", response_model=BookingResponse, status_code=201)
+def confirm_hold(hold_id: int):
+    """Transformer une réservation provisoire en réservation définitive"""
+    hold = scheduler.get_hold(hold_id)
+    if not hold:
+        raise HTTPException(status_code=404, detail=f"Hold {hold_id} not found")
+    if not hold.is_active():
+        status = hold.status if hold.status != Hold.ACTIVE else Hold.EXPIRED
+        raise HTTPException(status_code=400, detail=f"Hold {hold_id} is {status}")
+    
+    booking = scheduler.confirm_hold(hold_id)
+    if booking is None:
+        raise HTTPException(status_code=400, detail=f"Hold {hold_id} could not be confirmed")
+    return json_response(encode_booking(booking), status_code=201)
+
+@app.delete("/holds/{hold_id}", status_code=204)
+def release_hold(hold_id: int):
+    """Libérer une réservation provisoire"""
+    if not scheduler.release_hold(hold_id):
+        raise HTTPException(status_code=404, detail=f"Active hold {hold_id} not found")
+
+def hold_response(hold: Hold) -> dict:
+    """Construire la réponse d'une réservation provisoire"""
+    return {
+        "id": hold.id,
+        "room_id": hold.room_id,
+        "event_name": hold.event_name,
+        "attendees": hold.attendees,
+        "required_equipments": hold.required_equipments,
+        "start_date": hold.start_date,
+        "end_date": hold.end_date,
+        "expires_at": hold.expires_at,
+        "status": hold.status,
+        "booking_id": hold.booking_id
+    }
+
+# ==================== Scenario Endpoints ====================
+
+def get_scenario(scenario_id: int) -> Scenario:
+    """Scénario ouvert, ou erreur HTTP"""
+    if scenarios is None:
+        raise HTTPException(status_code=501, detail="Scenarios are not available on a sharded deployment")
+    scenario = scenarios.get(scenario_id)
+    if not scenario:
+        raise HTTPException(status_code=404, detail=f"Scenario {scenario_id} not found")
+    return scenario
+
+def scenario_response(scenario: Scenario) -> dict:
+    """Construire le résumé d'un scénario"""
+    removed, added = scenario.diff()
     return {
-        "room": {
-            "id": room.id,
-            "name": room.name,
-            "capacity": room.capacity,
-            "equipments": room.equipments
-        },
-        "bookings": [
+        "id": scenario.id,
+        "name": scenario.name,
+        "created_at": scenario.created_at,
+        "removed": len(removed),
+        "added": len(added),
+        "closed_rooms": sorted(scenario.closed_rooms)
+    }
+
+@app.post("/scenarios", response_model=ScenarioResponse, status_code=201)
+def create_scenario(scenario: ScenarioCreate):
+    """Créer un scénario: copie instantanée des réservations, modifiable sans toucher à la production"""
+    if scenarios is None:
+        raise HTTPException(status_code=501, detail="Scenarios are not available on a sharded deployment")
+    return scenario_response(scenarios.create(scenario.name))
+
+@app.get("/scenarios", response_model=List[ScenarioResponse])
+def get_scenarios():
+    """Lister les scénarios ouverts"""
+    if scenarios is None:
+        return []
+    return [scenario_response(s) for s in list(scenarios.scenarios.values())]
+
+@app.get("/scenarios/{scenario_id}", response_model=ScenarioResponse)
+def get_scenario_summary(scenario_id: int):
+    """Résumé d'un scénario"""
+    return scenario_response(get_scenario(scenario_id))
+
+@app.delete("/scenarios/{scenario_id}", status_code=204)
+def discard_scenario(scenario_id: int):
+    """Abandonner un scénario"""
+    scenarios.discard(get_scenario(scenario_id).id)
+
+@app.get("/scenarios/{scenario_id}/diff", response_model=ScenarioDiffResponse)
+def get_scenario_diff(scenario_id: int):
+    """Différences entre le scénario et les réservations au moment de sa création"""
+    scenario = get_scenario(scenario_id)
+    removed, added = scenario.diff()
+    return {
+        "removed": [booking_to_dict(b) for b in removed],
+        "added": [
             {
                 "id": b.id,
+                "room_id": b.room_id,
                 "event_id": b.event_id,
+                "event_name": e.name,
+                "attendees": e.attendees,
+                "required_equipments": e.required_equipments,
                 "start_date": b.start_date,
-                "end_date": b.end_date,
-                "duration_hours": b.duration_hours
+                "end_date": b.end_date
             }
-            for b in bookings
-        ]
+            for b, e in added
+        ],
+        "closed_rooms": sorted(scenario.closed_rooms)
+    }
+
+@app.post("/scenarios/{scenario_id}/bookings", response_model=BookingResponse, status_code=201)
+def create_scenario_booking(scenario_id: int, booking: BookingCreate):
+    """Réserver une salle dans le scénario"""
+    scenario = get_scenario(scenario_id)
+    try:
+        new_booking = scenario.create_booking(
+            room_id=booking.room_id,
+            event_name=booking.event_name,
+            attendees=booking.attendees,
+            required_equipments=booking.required_equipments,
+            start_date=booking.start_date,
+            end_date=booking.end_date
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return json_response(encode_booking(new_booking), status_code=201)
+
+@app.get("/scenarios/{scenario_id}/rooms/{room_id}/bookings", response_model=List[BookingResponse])
+def get_scenario_room_bookings(scenario_id: int, room_id: int):
+    """Réservations d'une salle dans le scénario"""
+    bookings = sorted(get_scenario(scenario_id).room_bookings(room_id), key=lambda b: b.start_date)
+    return json_response(encode_list(bookings, encode_booking))
+
+@app.delete("/scenarios/{scenario_id}/bookings/{booking_id}", status_code=204)
+def cancel_scenario_booking(scenario_id: int, booking_id: int):
+    """Annuler une réservation dans le scénario"""
+    if not get_scenario(scenario_id).cancel_booking(booking_id):
+        raise HTTPException(status_code=404, detail=f"Booking {booking_id} not found")
+
+@app.post("/scenarios/{scenario_id}/bookings/{booking_id}/move", response_model=BookingResponse)
+def move_scenario_booking(scenario_id: int, booking_id: int, move: BookingMove):
+    """Déplacer une réservation (autre salle et/ou autre créneau) dans le scénario"""
+    scenario = get_scenario(scenario_id)
+    try:
+        booking = scenario.move_booking(booking_id, move.room_id, move.start_date, move.end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return json_response(encode_booking(booking))
+
+@app.post("/scenarios/{scenario_id}/rooms/{room_id}/close")
+def close_scenario_room(scenario_id: int, room_id: int):
+    """Fermer une salle dans le scénario: ses réservations sont annulées"""
+    try:
+        cancelled = get_scenario(scenario_id).close_room(room_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"room_id": room_id, "cancelled": cancelled}
+
+@app.post("/scenarios/{scenario_id}/availability/check", response_model=AvailabilityResponse)
+def check_scenario_availability(
+    scenario_id: int,
+    availability: AvailabilityCheck,
+    limit: Optional[int] = Query(None, ge=1),
+    order: str = Query("id", pattern=f"^({'|'.join(ROOM_ORDERS)})$")
+):
+    """Vérifier les salles disponibles dans le scénario"""
+    event = Event(0, availability.event_name, availability.attendees, availability.required_equipments)
+    available_rooms = get_scenario(scenario_id).find_available_rooms(
+        event, availability.start_date, availability.end_date, limit, order
+    )
+    available = b"true" if available_rooms else b"false"
+    return json_response(b'{"available":' + available +
+                         b',"rooms":' + encode_list(available_rooms, encode_room) + b"}")
+
+@app.post("/scenarios/{scenario_id}/commit", response_model=ScenarioCommitResponse)
+def commit_scenario(scenario_id: int):
+    """Appliquer le scénario aux vraies réservations, en une seule transaction"""
+    scenario = get_scenario(scenario_id)
+    try:
+        removed_ids, created = scenario.commit()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    scenarios.discard(scenario_id)
+    return {
+        "removed_booking_ids": removed_ids,
+        "created": [booking_to_dict(b) for b in created]
+    }
+
+# ==================== Search Endpoints ====================
+
+@app.get("/search", response_model=SearchResponse)
+def search(
+    q: str = Query(..., min_length=1),
+    kind: Optional[str] = Query(None, description="room ou event"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """Rechercher des salles et des événements par nom ou équipement (préfixes acceptés)"""
+    if kind and kind not in KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {', '.join(KINDS)}")
+    # Un résultat de plus que demandé indique s'il reste une page suivante
+    results = scheduler.search(q, kind, limit + 1, offset)
+    return {
+        "query": q,
+        "results": results[:limit],
+        "limit": limit,
+        "offset": offset,
+        "has_more": len(results) > limit
+    }
+
+# ==================== Export Endpoints ====================
+
+def export_response(batches, schema, format: str, filename: str):
+    """Flux IPC Arrow envoyé au fil des lots, ou fichier Parquet temporaire"""
+    if format == "arrow":
+        return StreamingResponse(ipc_stream(batches, schema), media_type=ARROW_STREAM_MEDIA_TYPE,
+                                 headers={"Content-Disposition": f'attachment; filename="{filename}.arrows"'})
+    
+    fd, path = tempfile.mkstemp(suffix=".parquet")
+    os.close(fd)
+    write_parquet(batches, schema, path)
+    return FileResponse(path, media_type="application/vnd.apache.parquet",
+                        filename=f"{filename}.parquet", background=BackgroundTask(os.remove, path))
+
+@app.get("/export/bookings")
+def export_bookings(
+    format: str = Query("arrow", pattern="^(arrow|parquet)$"),
+    start_date: Annotated[Optional[LocalDatetime], Query()] = None,
+    end_date: Annotated[Optional[LocalDatetime], Query()] = None,
+    room_ids: Optional[List[int]] = Query(None),
+    include_archived: bool = False
+):
+    """Exporter les réservations au format Arrow (flux IPC) ou Parquet"""
+    batches = booking_batches(scheduler.db_paths, start_date, end_date, room_ids, include_archived)
+    return export_response(batches, BOOKING_SCHEMA, format, "bookings")
+
+@app.get("/export/rooms")
+def export_rooms(
+    format: str = Query("arrow", pattern="^(arrow|parquet)$"),
+    room_ids: Optional[List[int]] = Query(None)
+):
+    """Exporter les salles au format Arrow (flux IPC) ou Parquet"""
+    return export_response(room_batches(scheduler.db_paths, room_ids), ROOM_SCHEMA, format, "rooms")
+
+# ==================== Import Endpoints ====================
+
+@app.post("/import/{table}", response_model=ImportResponse)
+def import_file(
+    table: str,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern=f"^({'|'.join(FORMATS)})$")
+):
+    """Importer des salles ou des réservations depuis un fichier CSV ou Parquet, par lots
+    
+    Chaque lot est enregistré au fil de la lecture: si le fichier s'avère invalide en cours
+    de route, la réponse 400 contient aussi le rapport des lignes déjà importées.
+    """
+    if table not in IMPORTERS:
+        raise HTTPException(status_code=404, detail=f"Unknown import table '{table}'")
+    
+    chunks = read_chunks(file.file, format or format_for(file.filename or ""))
+    report = ImportReport()
+    try:
+        IMPORTERS[table](scheduler, chunks, report)
+    except (ValueError, KeyError, UnicodeDecodeError) as e:
+        report.error = f"Invalid {table} file: {e}"
+        return json_response(orjson.dumps(dict(report.to_dict(), detail=report.error)), 400)
+    return report.to_dict()
+
+# ==================== Audit Endpoints ====================
+
+def all_conflicts(room_ids: Optional[List[int]]):
+    """Réservations qui se chevauchent, base par base (une par shard)"""
+    return itertools.chain.from_iterable(find_conflicts(path, room_ids) for path in scheduler.db_paths)
+
+@app.get("/audit/conflicts")
+def audit_conflicts(room_ids: Optional[List[int]] = Query(None)):
+    """Lister en flux (NDJSON) toutes les paires de réservations qui se chevauchent"""
+    lines = (orjson.dumps(conflict) + b"\n" for conflict in all_conflicts(room_ids))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+@app.post("/audit/repair")
+def repair_conflicts(room_ids: Optional[List[int]] = Query(None)):
+    """Supprimer les réservations en conflit, en gardant à chaque fois la plus ancienne"""
+    conflicts = list(all_conflicts(room_ids))
+    dropped = bookings_to_drop(conflicts)
+    removed = scheduler.remove_bookings(dropped) if dropped else 0
+    return {
+        "conflicts": len(conflicts),
+        "removed": removed,
+        "removed_booking_ids": dropped
+    }
+
+# ==================== Archive Endpoints ====================
+
+@app.post("/archive")
+def archive_bookings(retention_days: int = Query(None, ge=0)):
+    """Archiver maintenant les réservations terminées depuis plus de retention_days jours"""
+    if retention_days is None:
+        retention_days = archiver.retention_days
+    cutoff = datetime.now() - timedelta(days=retention_days)
+    archived = scheduler.archive_bookings_before(cutoff)
+    return {
+        "archived": archived,
+        "cutoff": cutoff,
+        "watermark": scheduler.archive_watermark
     }
 
 # ==================== Health Check ====================
@@ -2,14 +2,25 @@ from datetime import datetime
 from typing import List
 
 
-class Room:
+class CachedEncoding:
+    """Mixin dropping the cached JSON encoding (see app.serializers) on mutation."""
+    
+    def __setattr__(self, name, value):
+        if name != "_encoded":
+            self.__dict__.pop("_encoded", None)
+        super().__setattr__(name, value)
+
+
+class Room(CachedEncoding):
     """Represents a room with capacity and equipment."""
     
-    def __init__(self, id: int, name: str, capacity: int, equipments: List[str]):
+    def __init__(self, id: int, name: str, capacity: int, equipments: List[str],
+                 site: str = "main"):
         self.id = id
         self.name = name
         self.capacity = capacity
         self.equipments = equipments
+        self.site = site
     
     def has_equipment(self, equipment: str) -> bool:
         """Check if room has specific equipment."""
@@ -23,7 +34,7 @@ class Room:
         return f"Room {self.id}: {self.name} (Capacity: {self.capacity})"
     
     def __repr__(self):
-        return f"Room(id={self.id}, name='{self.name}', capacity={self.capacity}, equipments={self.equipments})"
+        return f"Room(id={self.id}, name='{self.name}', capacity={self.capacity}, equipments={self.equipments}, site='{self.site}')"
 
 
 class Event:
@@ -48,7 +59,7 @@ class Event:
         return f"Event(id={self.id}, name='{self.name}', attendees={self.attendees}, required_equipments={self.required_equipments})"
 
 
-class Booking:
+class Booking(CachedEncoding):
     """Represents a booking linking a room to an event for a time period."""
     
     def __init__(self, id: int, room_id: int, event_id: int, 
@@ -0,0 +1,283 @@
+"""What-if scenarios forked from the live scheduler.
+
+A scenario starts as a copy of the scheduler's per-room booking index.
+The index maps each room to an immutable tuple, so forking only copies
+the room -> tuple mapping and shares every booking collection with the
+live scheduler. Changes are written to an overlay that replaces the
+tuple of each modified room; untouched rooms keep pointing at the
+shared base, however many scenarios are open.
+
+The diff against the base is the set of base bookings missing from the
+overlay (removed) plus the scenario's own bookings (added, with
+temporary negative IDs). Committing re-checks the diff against the
+live state and applies it in one database transaction.
+"""
+import itertools
+import threading
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.models import Room, Event, Booking
+from app.scheduler import ROOM_ORDERS, Scheduler
+
+
+class Scenario:
+    """Copy-on-write sandbox of the scheduler's bookings."""
+
+    def __init__(self, id: int, name: str, scheduler: Scheduler):
+        self.id = id
+        self.name = name
+        self.scheduler = scheduler
+        self.created_at = datetime.now()
+        self.lock = threading.RLock()
+        with scheduler.lock:
+            self.base: Dict[int, Tuple[Booking, ...]] = dict(scheduler.room_bookings)
+            self.rooms: List[Room] = list(scheduler.rooms)
+            self.rooms_by_capacity: List[tuple] = scheduler.rooms_by_capacity
+        self.overlay: Dict[int, Tuple[Booking, ...]] = {}
+        self.closed_rooms: Set[int] = set()
+        # Bookings created (or moved) in the scenario and their events, by temporary ID
+        self.added_bookings: Dict[int, Booking] = {}
+        self.new_events: Dict[int, Event] = {}
+        self._next_id = itertools.count(-1, -1)
+        self._base_by_id: Optional[Dict[int, Booking]] = None
+        self._events_by_id: Optional[Dict[int, Event]] = None
+
+    # ---------- Reads ----------
+
+    def room_bookings(self, room_id: int) -> Tuple[Booking, ...]:
+        """Bookings of a room as seen in the scenario."""
+        bookings = self.overlay.get(room_id)
+        return self.base.get(room_id, ()) if bookings is None else bookings
+
+    def get_room_by_id(self, room_id: int) -> Optional[Room]:
+        return next((r for r in self.rooms if r.id == room_id), None)
+
+    def get_booking(self, booking_id: int) -> Optional[Booking]:
+        """Find a booking still present in the scenario."""
+        if booking_id < 0:
+            return self.added_bookings.get(booking_id)
+        if self._base_by_id is None:
+            self._base_by_id = {b.id: b for bookings in self.base.values() for b in bookings}
+        booking = self._base_by_id.get(booking_id)
+        if booking is None or booking not in self.room_bookings(booking.room_id):
+            return None
+        return booking
+
+    def is_room_available(self, room_id: int, start_date: datetime, end_date: datetime,
+                          exclude_booking_id: int = None) -> bool:
+        """Check availability in the scenario (holds and archive are read from the live scheduler)."""
+        if room_id in self.closed_rooms:
+            return False
+        for booking in self.room_bookings(room_id):
+            if booking.id == exclude_booking_id:
+                continue
+            if start_date < booking.end_date and end_date > booking.start_date:
+                return False
+        return self._live_extras_free(room_id, start_date, end_date)
+
+    def find_available_rooms(self, event: Event, start_date: datetime, end_date: datetime,
+                             limit: int = None, order: str = "id") -> List[Room]:
+        """Same as Scheduler.find_available_rooms, on the scenario's bookings."""
+        if order not in ROOM_ORDERS:
+            raise ValueError(f"Unknown order '{order}', expected one of {list(ROOM_ORDERS)}")
+
+        if order == "best_fit":
+            start = bisect_left(self.rooms_by_capacity, (event.attendees,))
+            candidates = (self.rooms_by_capacity[i][2]
+                          for i in range(start, len(self.rooms_by_capacity)))
+        else:
+            candidates = iter(self.rooms)
+
+        available_rooms = []
+        for room in candidates:
+            if event.is_suitable_for_room(room) and \
+                    self.is_room_available(room.id, start_date, end_date):
+                available_rooms.append(room)
+                if limit is not None and len(available_rooms) >= limit:
+                    break
+        return available_rooms
+
+    # ---------- Writes ----------
+
+    def create_booking(self, room_id: int, event_name: str, attendees: int,
+                       required_equipments: List[str], start_date: datetime,
+                       end_date: datetime) -> Booking:
+        """Book a room in the scenario only."""
+        event = Event(0, event_name, attendees, required_equipments)
+        with self.lock:
+            return self._place(event, room_id, start_date, end_date)
+
+    def cancel_booking(self, booking_id: int) -> bool:
+        """Remove a booking from the scenario."""
+        with self.lock:
+            booking = self.get_booking(booking_id)
+            if booking is None:
+                return False
+            self._drop(booking)
+            return True
+
+    def move_booking(self, booking_id: int, room_id: int = None, start_date: datetime = None,
+                     end_date: datetime = None) -> Booking:
+        """Move a booking to another room and/or period, keeping its event."""
+        with self.lock:
+            booking = self.get_booking(booking_id)
+            if booking is None:
+                raise ValueError(f"Booking {booking_id} not found")
+            event = self._event_of(booking)
+            self._drop(booking)
+            try:
+                moved = self._place(event, room_id or booking.room_id,
+                                    start_date or booking.start_date, end_date or booking.end_date)
+            except ValueError:
+                self._put(booking, event if booking.id < 0 else None)
+                raise
+            # A booking moved from the base keeps its event row on commit
+            moved.event_id = booking.event_id
+            return moved
+
+    def close_room(self, room_id: int) -> int:
+        """Take a room out of the scenario: its bookings are cancelled and it can't be booked."""
+        with self.lock:
+            if self.get_room_by_id(room_id) is None:
+                raise ValueError(f"Room {room_id} not found")
+            bookings = self.room_bookings(room_id)
+            for booking in bookings:
+                self.added_bookings.pop(booking.id, None)
+                self.new_events.pop(booking.id, None)
+            self.overlay[room_id] = ()
+            self.closed_rooms.add(room_id)
+            return len(bookings)
+
+    # ---------- Diff and commit ----------
+
+    def diff(self) -> Tuple[List[Booking], List[Tuple[Booking, Event]]]:
+        """(removed base bookings, added bookings with their events)."""
+        with self.lock:
+            removed, added = [], []
+            for room_id, bookings in self.overlay.items():
+                current = set(map(id, bookings))
+                removed += [b for b in self.base.get(room_id, ()) if id(b) not in current]
+                added += [(b, self.new_events[b.id]) for b in bookings if b.id < 0]
+            return removed, added
+
+    def commit(self) -> Tuple[List[int], List[Booking]]:
+        """Apply the diff to the live scheduler atomically.
+
+        Fails with ValueError, leaving everything untouched, when a removed
+        booking no longer exists or an added one now overlaps a live
+        booking or hold. Returns the removed IDs and the created bookings.
+        """
+        scheduler = self.scheduler
+        with self.lock, scheduler.lock:
+            removed, added = self.diff()
+            removed_ids = {b.id for b in removed}
+
+            live = {b.id for room_id in {b.room_id for b in removed}
+                    for b in scheduler.room_bookings.get(room_id, ())}
+            missing = sorted(removed_ids - live)
+            if missing:
+                raise ValueError(f"Bookings {missing} no longer exist")
+
+            for booking, _ in added:
+                others = itertools.chain(scheduler.room_bookings.get(booking.room_id, ()),
+                                         scheduler.pending_bookings.get(booking.room_id, ()))
+                clash = next((b for b in others if b.id not in removed_ids
+                              and booking.start_date < b.end_date
+                              and booking.end_date > b.start_date), None)
+                if clash or not self._live_extras_free(booking.room_id, booking.start_date,
+                                                       booking.end_date):
+                    raise ValueError(f"Room {booking.room_id} is no longer available "
+                                     f"from {booking.start_date} to {booking.end_date}")
+
+            created = [Booking(0, b.room_id, b.event_id, b.start_date, b.end_date)
+                       for b, _ in added]
+            pairs = [(Event(0, e.name, e.attendees, e.required_equipments)
+                      if b.event_id <= 0 else None, new)
+                     for (b, e), new in zip(added, created)]
+            scheduler.db.apply_booking_changes(sorted(removed_ids), pairs)
+
+            scheduler.events.extend(event for event, _ in pairs if event is not None)
+            scheduler._remove_bookings(removed)
+            scheduler._add_bookings(created)
+            print(f"✓ Scenario '{self.name}' committed: {len(removed)} booking(s) removed, "
+                  f"{len(created)} added")
+        # Outside the lock: promotions wait for their bookings to be written
+        for booking in removed:
+            scheduler.promote_waitlist(booking.room_id, booking.start_date, booking.end_date)
+        return sorted(removed_ids), created
+
+    # ---------- Internals ----------
+
+    def _live_extras_free(self, room_id: int, start_date: datetime, end_date: datetime) -> bool:
+        """Intervals blocked outside the booking index: active holds and archived bookings."""
+        scheduler = self.scheduler
+        now = datetime.now()
+        for hold in scheduler.holds.room_holds(room_id):
+            if hold.is_active(now) and start_date < hold.end_date and end_date > hold.start_date:
+                return False
+        if scheduler.reaches_archive(start_date):
+            return not scheduler.db.get_archived_bookings(room_id, start_date, end_date)
+        return True
+
+    def _event_of(self, booking: Booking) -> Event:
+        if booking.id < 0:
+            return self.new_events[booking.id]
+        if self._events_by_id is None:
+            self._events_by_id = {e.id: e for e in self.scheduler.events}
+        event = self._events_by_id.get(booking.event_id)
+        if event is None:
+            raise ValueError(f"Event of booking {booking.id} not found")
+        return event
+
+    def _place(self, event: Event, room_id: int, start_date: datetime,
+               end_date: datetime) -> Booking:
+        room = self.get_room_by_id(room_id)
+        if room is None or room_id in self.closed_rooms:
+            raise ValueError(f"Room {room_id} not found")
+        if start_date >= end_date:
+            raise ValueError("Start date must be before end date")
+        if not event.is_suitable_for_room(room):
+            raise ValueError(f"Room '{room.name}' is not suitable for '{event.name}'")
+        if not self.is_room_available(room_id, start_date, end_date):
+            raise ValueError(f"Room '{room.name}' is not available during the requested time")
+
+        booking = Booking(next(self._next_id), room_id, 0, start_date, end_date)
+        self._put(booking, event)
+        return booking
+
+    def _put(self, booking: Booking, event: Event = None):
+        self.overlay[booking.room_id] = self.room_bookings(booking.room_id) + (booking,)
+        if event is not None:
+            self.added_bookings[booking.id] = booking
+            self.new_events[booking.id] = event
+
+    def _drop(self, booking: Booking):
+        self.overlay[booking.room_id] = tuple(b for b in self.room_bookings(booking.room_id)
+                                              if b is not booking)
+        self.added_bookings.pop(booking.id, None)
+        self.new_events.pop(booking.id, None)
+
+
+class ScenarioManager:
+    """Open scenarios of a scheduler."""
+
+    def __init__(self, scheduler: Scheduler):
+        self.scheduler = scheduler
+        self.scenarios: Dict[int, Scenario] = {}
+        self._next_id = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create(self, name: str) -> Scenario:
+        with self._lock:
+            scenario = Scenario(next(self._next_id), name, self.scheduler)
+            self.scenarios[scenario.id] = scenario
+        return scenario
+
+    def get(self, scenario_id: int) -> Optional[Scenario]:
+        return self.scenarios.get(scenario_id)
+
+    def discard(self, scenario_id: int) -> bool:
+        with self._lock:
+            return self.scenarios.pop(scenario_id, None) is not None
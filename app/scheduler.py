@@ -1,27 +1,109 @@
+import itertools
+import threading
+import time
+from bisect import bisect_left, insort
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from app.models import Room, Event, Booking
 from app.database import Database
+from app.waitlist import Waitlist, WaitlistEntry
+from app.holds import DEFAULT_HOLD_TTL, MAX_HOLD_TTL, Hold, HoldTable
+from app.cache import AvailabilityCache
+from app.writer import GroupCommitWriter
+
+# Orderings of find_available_rooms: insertion order, or smallest fitting room first
+ROOM_ORDERS = ("id", "best_fit")
 
 
 class Scheduler:
     """Manages rooms, events, and bookings with database persistence."""
     
-    def __init__(self, db_path: str = "booking_system.db"):
-        self.db = Database(db_path)
+    def __init__(self, db_path: str = "booking_system.db", id_offset: int = 0):
+        self.db = Database(db_path, id_offset)
+        # Serialises check-then-write sequences coming from concurrent API requests
+        self.lock = threading.RLock()
+        self.waitlist = Waitlist(id_offset + 1)
+        self.holds = HoldTable(id_offset + 1)
+        # Bookings accepted but not yet committed by the writer still block their slot
+        self.pending_bookings: Dict[int, List[Booking]] = {}
+        self.writer = GroupCommitWriter(self.db)
+        # Answers of availability queries, invalidated per room as bookings change
+        self.availability_cache = AvailabilityCache()
         self.load_from_database()
+        self._hold_expiry = threading.Thread(target=self._expire_holds, name="hold-expiry",
+                                             daemon=True)
+        self._hold_expiry.start()
+    
+    @property
+    def db_paths(self) -> List[str]:
+        """Database files holding this scheduler's data."""
+        return [self.db.db_path]
     
     def load_from_database(self):
         """Load all data from the database."""
         self.rooms = self.db.get_all_rooms()
+        self.reindex_rooms()
         self.events = self.db.get_all_events()
         self.bookings = self.db.get_all_bookings()
+        self.reindex_bookings()
+        # Bookings ending before this date may live in the archive table only
+        self.archive_watermark = self.db.get_archive_watermark()
+    
+    def reindex_rooms(self):
+        """Rebuild the capacity-sorted index of rooms."""
+        # (capacity, id, room) entries; IDs are unique so rooms are never compared
+        self.rooms_by_capacity: List[tuple] = sorted((r.capacity, r.id, r) for r in self.rooms)
+    
+    def _index_rooms(self, rooms: List[Room]):
+        # Copy on write, so concurrent readers keep iterating a consistent list
+        rooms_by_capacity = list(self.rooms_by_capacity)
+        for room in rooms:
+            insort(rooms_by_capacity, (room.capacity, room.id, room))
+        self.rooms_by_capacity = rooms_by_capacity
+        self.availability_cache.invalidate_all()
+    
+    def reindex_bookings(self):
+        """Rebuild the per-room index of bookings."""
+        room_bookings: Dict[int, List[Booking]] = {}
+        for booking in self.bookings:
+            room_bookings.setdefault(booking.room_id, []).append(booking)
+        # Immutable per-room tuples: scenario forks (app.scenarios) share them without copying
+        self.room_bookings: Dict[int, Tuple[Booking, ...]] = {
+            room_id: tuple(bookings) for room_id, bookings in room_bookings.items()
+        }
+        self.availability_cache.invalidate_all()
     
-    def add_room(self, room: Room):
+    def _add_bookings(self, bookings: List[Booking]):
+        self.bookings.extend(bookings)
+        by_room: Dict[int, List[Booking]] = {}
+        for booking in bookings:
+            by_room.setdefault(booking.room_id, []).append(booking)
+        for room_id, added in by_room.items():
+            self.room_bookings[room_id] = self.room_bookings.get(room_id, ()) + tuple(added)
+            self.availability_cache.bump(room_id)
+    
+    def _add_booking(self, booking: Booking):
+        self._add_bookings([booking])
+    
+    def _remove_bookings(self, bookings: List[Booking]):
+        removed = set(map(id, bookings))
+        self.bookings = [b for b in self.bookings if id(b) not in removed]
+        for room_id in {booking.room_id for booking in bookings}:
+            self.room_bookings[room_id] = tuple(b for b in self.room_bookings.get(room_id, ())
+                                                if id(b) not in removed)
+            self.availability_cache.bump(room_id)
+    
+    def _remove_booking(self, booking: Booking):
+        self._remove_bookings([booking])
+    
+    def add_room(self, room: Room) -> Room:
         """Add a room to the scheduler and save to database."""
-        self.rooms.append(room)
-        self.db.save_room(room)
+        with self.lock:
+            self.rooms.append(room)
+            self.db.save_room(room)
+            self._index_rooms([room])
         print(f"✓ Room '{room.name}' added")
+        return room
     
     def add_event(self, event: Event):
         """Add an event to the scheduler and save to database."""
@@ -37,93 +119,461 @@ class Scheduler:
         """Find an event by its ID."""
         return next((e for e in self.events if e.id == event_id), None)
     
+    def get_all_rooms(self) -> List[Room]:
+        """Get all rooms."""
+        return self.rooms
+    
+    def get_all_bookings(self, include_archived: bool = False) -> List[Booking]:
+        """Get all bookings, optionally including archived ones."""
+        if include_archived and self.archive_watermark:
+            return self.db.get_archived_bookings() + self.bookings
+        return self.bookings
+    
+    def get_booking(self, booking_id: int) -> Optional[Booking]:
+        """Find a booking by its ID, looking into the archive if needed."""
+        booking = next((b for b in self.bookings if b.id == booking_id), None)
+        if booking is None and self.archive_watermark:
+            booking = self.db.get_archived_booking(booking_id)
+        return booking
+    
+    def get_room_bookings(self, room_id: int, include_archived: bool = False) -> List[Booking]:
+        """Get all bookings of a room, optionally including archived ones."""
+        bookings = list(self.room_bookings.get(room_id, []))
+        if include_archived and self.archive_watermark:
+            bookings = self.db.get_archived_bookings(room_id) + bookings
+        return bookings
+    
+    def search(self, query: str, kind: str = None, limit: int = 20,
+               offset: int = 0, ranking: str = "bm25") -> List[dict]:
+        """Search rooms and events by name or equipment prefix, best matches first."""
+        return self.db.search(query, kind, limit, offset, ranking)
+    
+    def reaches_archive(self, start_date: Optional[datetime]) -> bool:
+        """Whether a period starting at start_date may overlap archived bookings."""
+        if self.archive_watermark is None:
+            return False
+        return start_date is None or start_date < self.archive_watermark
+    
     def find_available_rooms(self, event: Event, start_date: datetime, 
-                            end_date: datetime) -> List[Room]:
-        """Find all rooms that can accommodate the event and are available."""
-        available_rooms = []
+                            end_date: datetime, limit: int = None,
+                            order: str = "id", exclude_hold_id: int = None) -> List[Room]:
+        """Find the rooms that can accommodate the event and are available.
+        
+        With order="best_fit" rooms come smallest first (least wasted
+        capacity): the capacity index is bisected to the first room large
+        enough and the scan stops as soon as `limit` rooms are found.
+        The hold exclude_hold_id doesn't count, so its owner still sees the
+        room it holds. Answers are cached until one of the scanned rooms changes.
+        """
+        if order not in ROOM_ORDERS:
+            raise ValueError(f"Unknown order '{order}', expected one of {list(ROOM_ORDERS)}")
+        
+        key = ("rooms", start_date, end_date, event.attendees,
+               frozenset(event.required_equipments), limit, order, exclude_hold_id)
+        cached = self.availability_cache.get(key)
+        if cached is not None:
+            return list(cached)
+        
+        stamp = self.availability_cache.stamp()
+        available_rooms, scanned = self._scan_available_rooms(event, start_date, end_date,
+                                                              limit, order, exclude_hold_id)
+        self.availability_cache.put(key, tuple(available_rooms), scanned, stamp)
+        return available_rooms
+    
+    def _scan_available_rooms(self, event: Event, start_date: datetime, end_date: datetime,
+                              limit: int, order: str,
+                              exclude_hold_id: int = None) -> Tuple[List[Room], List[int]]:
+        """Available rooms, and the IDs of the suitable rooms whose availability was checked."""
+        if order == "best_fit":
+            rooms_by_capacity = self.rooms_by_capacity
+            start = bisect_left(rooms_by_capacity, (event.attendees,))
+            candidates = (rooms_by_capacity[i][2] for i in range(start, len(rooms_by_capacity)))
+        else:
+            candidates = iter(self.rooms)
         
-        for room in self.rooms:
+        available_rooms = []
+        scanned = []
+        for room in candidates:
             if not event.is_suitable_for_room(room):
                 continue
             
-            if self.is_room_available(room.id, start_date, end_date):
+            scanned.append(room.id)
+            if self.is_room_available(room.id, start_date, end_date,
+                                      exclude_hold_id=exclude_hold_id):
                 available_rooms.append(room)
+                if limit is not None and len(available_rooms) >= limit:
+                    break
         
-        return available_rooms
+        return available_rooms, scanned
+    
+    def check_room_availability(self, room_id: int, start_date: datetime,
+                                end_date: datetime) -> bool:
+        """Cached is_room_available, for read-only availability queries."""
+        key = ("room", room_id, start_date, end_date)
+        cached = self.availability_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        stamp = self.availability_cache.stamp()
+        available = self.is_room_available(room_id, start_date, end_date)
+        self.availability_cache.put(key, available, [room_id], stamp)
+        return available
     
     def is_room_available(self, room_id: int, start_date: datetime, 
-                         end_date: datetime, exclude_booking_id: int = None) -> bool:
+                         end_date: datetime, exclude_booking_id: int = None,
+                         exclude_hold_id: int = None) -> bool:
         """Check if a room is available during a specific time period."""
-        for booking in self.bookings:
-            if booking.room_id != room_id:
-                continue
-            
+        for booking in itertools.chain(self.room_bookings.get(room_id, ()),
+                                       self.pending_bookings.get(room_id, ())):
             if exclude_booking_id and booking.id == exclude_booking_id:
                 continue
             
             if start_date < booking.end_date and end_date > booking.start_date:
                 return False
         
+        now = datetime.now()
+        for hold in self.holds.room_holds(room_id):
+            if hold.id == exclude_hold_id or not hold.is_active(now):
+                continue
+            
+            if start_date < hold.end_date and end_date > hold.start_date:
+                return False
+        
+        if self.reaches_archive(start_date):
+            return not self.db.get_archived_bookings(room_id, start_date, end_date)
+        
         return True
     
     def create_booking(self, room_id: int, event_name: str, attendees: int,
                       required_equipments: List[str], start_date: datetime, 
-                      end_date: datetime) -> Optional[Booking]:
-        """Create an event and booking together if the room is available."""
-        room = self.get_room_by_id(room_id)
-        
-        if not room:
-            print(f"Error: Room {room_id} not found")
-            return None
-        
-        # Generate new event ID
-        event_id = max([e.id for e in self.events], default=0) + 1
-        
-        # Create the event
-        event = Event(event_id, event_name, attendees, required_equipments)
-        
-        # Validate room suitability
-        if not event.is_suitable_for_room(room):
-            print(f"Error: Room '{room.name}' is not suitable for '{event_name}'")
-            if room.capacity < event.attendees:
-                print(f"  - Capacity: {room.capacity} < {attendees} attendees")
-            missing_eq = [eq for eq in required_equipments if eq not in room.equipments]
-            if missing_eq:
-                print(f"  - Missing equipment: {', '.join(missing_eq)}")
-            return None
-        
-        # Check availability
-        if not self.is_room_available(room_id, start_date, end_date):
-            print(f"Error: Room '{room.name}' is not available during the requested time")
-            return None
-        
-        # Save event to database
-        self.events.append(event)
-        self.db.save_event(event)
+                      end_date: datetime, hold: Hold = None) -> Optional[Booking]:
+        """Create an event and booking together if the room is available.
         
-        # Create temporary booking with ID 0 (will be updated)
-        booking = Booking(0, room_id, event_id, start_date, end_date)
-        booking_id = self.db.save_booking(booking)
-        booking.id = booking_id
+        When confirming a hold, its own interval does not count as taken and
+        the hold is consumed once the booking is saved; if the save fails the
+        hold stays active.
+        """
+        with self.lock:
+            room = self.get_room_by_id(room_id)
+            
+            if not room:
+                print(f"Error: Room {room_id} not found")
+                return None
+            
+            if hold and not hold.is_active():
+                print(f"Error: Hold #{hold.id} is no longer active")
+                return None
+            
+            # Create the event (its ID is assigned by the database)
+            event = Event(0, event_name, attendees, required_equipments)
+            
+            # Validate room suitability
+            if not event.is_suitable_for_room(room):
+                print(f"Error: Room '{room.name}' is not suitable for '{event_name}'")
+                if room.capacity < event.attendees:
+                    print(f"  - Capacity: {room.capacity} < {attendees} attendees")
+                missing_eq = [eq for eq in required_equipments if eq not in room.equipments]
+                if missing_eq:
+                    print(f"  - Missing equipment: {', '.join(missing_eq)}")
+                return None
+            
+            # Check availability
+            if not self.is_room_available(room_id, start_date, end_date,
+                                          exclude_hold_id=hold.id if hold else None):
+                print(f"Error: Room '{room.name}' is not available during the requested time")
+                return None
+            
+            # Create temporary booking with ID 0 (will be updated) and hold its slot
+            booking = Booking(0, room_id, 0, start_date, end_date)
+            self.pending_bookings.setdefault(room_id, []).append(booking)
+            self.availability_cache.bump(room_id)
         
-        self.bookings.append(booking)
-        print(f"✓ Booking #{booking_id} created: '{event_name}' in '{room.name}'")
+        # Save event and booking outside the lock so concurrent requests share a commit
+        try:
+            self.writer.write(event, booking)
+        except Exception:
+            with self.lock:
+                self.pending_bookings[room_id].remove(booking)
+                self.availability_cache.bump(room_id)
+            raise
+        
+        # Move the booking from pending to the index in one step, so the slot
+        # is never seen free in between
+        with self.lock:
+            self.pending_bookings[room_id].remove(booking)
+            self.events.append(event)
+            self._add_booking(booking)
+            if hold:
+                self.holds.remove(hold, Hold.CONFIRMED, booking.id)
+        print(f"✓ Booking #{booking.id} created: '{event_name}' in '{room.name}'")
         return booking
     
+    def add_rooms(self, rooms: List[Room]) -> List[Room]:
+        """Save a batch of rooms in a single transaction."""
+        with self.lock:
+            self.db.save_rooms(rooms)
+            self.rooms.extend(rooms)
+            self._index_rooms(rooms)
+        return rooms
+    
+    def import_rooms(self, rooms: List[Room], rows: List[int] = None) -> List[Tuple[int, str]]:
+        """Save a batch of imported rooms in a single transaction.
+        
+        Returns (row, reason) for every rejected room, `rows` giving the source
+        row of each room. A single scheduler accepts every site, so nothing is
+        rejected here; the sharded router rejects rooms of unknown sites.
+        """
+        self.add_rooms(rooms)
+        return []
+    
+    def import_bookings(self, requests: List[dict]) -> List[Tuple[int, str]]:
+        """Validate and save a batch of booking requests in a single transaction.
+        
+        Each request (room_id, event_name, attendees, required_equipments,
+        start_date, end_date and its source "row") is checked against the room
+        and against existing bookings, including those accepted earlier in the
+        batch. Returns (row, reason) for every rejected request.
+        """
+        rejects = []
+        pairs = []
+        with self.lock:
+            for request in requests:
+                room = self.get_room_by_id(request["room_id"])
+                if not room:
+                    rejects.append((request["row"], f"Room {request['room_id']} not found"))
+                    continue
+                
+                event = Event(0, request["event_name"], request["attendees"],
+                              request["required_equipments"])
+                if room.capacity < event.attendees:
+                    rejects.append((request["row"], f"Capacity: {room.capacity} < {event.attendees} attendees"))
+                    continue
+                missing_eq = [eq for eq in event.required_equipments if eq not in room.equipments]
+                if missing_eq:
+                    rejects.append((request["row"], f"Missing equipment: {', '.join(missing_eq)}"))
+                    continue
+                
+                if not self.is_room_available(room.id, request["start_date"], request["end_date"]):
+                    rejects.append((request["row"], f"Room '{room.name}' is not available during the requested time"))
+                    continue
+                
+                booking = Booking(0, room.id, 0, request["start_date"], request["end_date"])
+                self.pending_bookings.setdefault(room.id, []).append(booking)
+                self.availability_cache.bump(room.id)
+                pairs.append((event, booking))
+        
+        try:
+            self.db.save_events_and_bookings(pairs)
+        except Exception:
+            with self.lock:
+                for _, booking in pairs:
+                    self.pending_bookings[booking.room_id].remove(booking)
+                    self.availability_cache.bump(booking.room_id)
+            raise
+        
+        # Same as create_booking: leave pending and enter the index in one step
+        with self.lock:
+            for _, booking in pairs:
+                self.pending_bookings[booking.room_id].remove(booking)
+            self.events.extend(event for event, _ in pairs)
+            self._add_bookings([booking for _, booking in pairs])
+        return rejects
+    
     def cancel_booking(self, booking_id: int) -> bool:
-        """Cancel a booking by its ID."""
-        booking = next((b for b in self.bookings if b.id == booking_id), None)
-        if booking:
-            self.bookings.remove(booking)
+        """Cancel a booking by its ID and promote waitlisted requests that now fit."""
+        with self.lock:
+            booking = next((b for b in self.bookings if b.id == booking_id), None)
+            if not booking:
+                print(f"Error: Booking {booking_id} not found")
+                return False
+            self._remove_booking(booking)
             self.db.delete_booking(booking_id)
             print(f"✓ Booking #{booking_id} cancelled")
+        self.promote_waitlist(booking.room_id, booking.start_date, booking.end_date)
+        return True
+    
+    def remove_bookings(self, booking_ids: List[int]) -> int:
+        """Delete bookings without promoting the waitlist (e.g. duplicates found by the audit)."""
+        ids = set(booking_ids)
+        with self.lock:
+            removed = self.db.delete_bookings(list(ids))
+            self.bookings = [b for b in self.bookings if b.id not in ids]
+            self.reindex_bookings()
+        return removed
+    
+    def archive_bookings_before(self, cutoff: datetime) -> int:
+        """Move bookings ending before the cutoff to the archive and evict them from memory.
+        
+        The bookings are selected once, in memory; exactly those are archived
+        in the database and, once that is committed, evicted.
+        """
+        with self.lock:
+            archived = [b for b in self.bookings if b.end_date < cutoff]
+            if not archived:
+                return 0
+            self.db.archive_bookings([b.id for b in archived])
+            self._remove_bookings(archived)
+            latest = max(b.end_date for b in archived)
+            if self.archive_watermark is None or latest > self.archive_watermark:
+                self.archive_watermark = latest
+            print(f"✓ {len(archived)} booking(s) archived before {cutoff:%Y-%m-%d %H:%M}")
+            return len(archived)
+    
+    def join_waitlist(self, room_id: int, event_name: str, attendees: int,
+                      required_equipments: List[str], start_date: datetime,
+                      end_date: datetime) -> WaitlistEntry:
+        """Queue a booking request for a busy room, or book it right away if free."""
+        with self.lock:
+            room = self.get_room_by_id(room_id)
+            if not room:
+                raise ValueError(f"Room {room_id} not found")
+            
+            event = Event(0, event_name, attendees, required_equipments)
+            if not event.is_suitable_for_room(room):
+                raise ValueError(f"Room '{room.name}' is not suitable for '{event_name}'")
+            
+            entry = self.waitlist.add(room_id, event_name, attendees, required_equipments,
+                                      start_date, end_date)
+            available = self.is_room_available(room_id, start_date, end_date)
+            if not available:
+                print(f"✓ Waitlist entry #{entry.id} queued for '{room.name}'")
+        if available:
+            self.promote_waitlist(room_id, start_date, end_date)
+        return entry
+    
+    def get_waitlist_entry(self, entry_id: int) -> Optional[WaitlistEntry]:
+        """Find a waitlist entry, whatever its state."""
+        return self.waitlist.get(entry_id)
+    
+    def get_room_waitlist(self, room_id: int) -> List[WaitlistEntry]:
+        """Waiting entries of a room in arrival order."""
+        with self.lock:
+            return self.waitlist.room_entries(room_id)
+    
+    def leave_waitlist(self, entry_id: int) -> bool:
+        """Withdraw a waiting request."""
+        with self.lock:
+            entry = self.waitlist.get(entry_id)
+            # An entry being promoted can no longer be withdrawn
+            if not entry or entry.status != WaitlistEntry.WAITING or self.waitlist.is_claimed(entry):
+                return False
+            self.waitlist.remove(entry, WaitlistEntry.CANCELLED)
             return True
-        print(f"Error: Booking {booking_id} not found")
-        return False
+    
+    def promote_waitlist(self, room_id: int, start_date: datetime, end_date: datetime):
+        """Book the waitlisted requests overlapping a freed interval, first come first served.
+        
+        Call it without holding the lock: each promotion waits for its booking
+        to be written, like create_booking. An entry whose booking fails stays
+        waiting.
+        """
+        with self.lock:
+            now = datetime.now()
+            candidates = []
+            for entry in self.waitlist.overlapping(room_id, start_date, end_date):
+                if entry.start_date < now:
+                    self.waitlist.remove(entry, WaitlistEntry.EXPIRED)
+                else:
+                    candidates.append(entry)
+        
+        for entry in candidates:
+            with self.lock:
+                if entry.status != WaitlistEntry.WAITING or self.waitlist.is_claimed(entry) or \
+                        not self.is_room_available(room_id, entry.start_date, entry.end_date):
+                    continue
+                self.waitlist.claim(entry)
+            
+            try:
+                booking = self.create_booking(room_id, entry.event_name, entry.attendees,
+                                              entry.required_equipments, entry.start_date,
+                                              entry.end_date)
+            except Exception as e:
+                print(f"Error: Waitlist entry #{entry.id} could not be promoted: {e}")
+                booking = None
+            
+            with self.lock:
+                if booking:
+                    self.waitlist.remove(entry, WaitlistEntry.PROMOTED, booking.id)
+                    print(f"✓ Waitlist entry #{entry.id} promoted to booking #{booking.id}")
+                else:
+                    self.waitlist.requeue(entry)
+    
+    def place_hold(self, room_id: int, event_name: str, attendees: int,
+                   required_equipments: List[str], start_date: datetime,
+                   end_date: datetime, ttl_seconds: float = DEFAULT_HOLD_TTL) -> Hold:
+        """Tentatively reserve a free room interval for `ttl_seconds`."""
+        if not 0 < ttl_seconds <= MAX_HOLD_TTL:
+            raise ValueError(f"Hold TTL must be between 1 and {MAX_HOLD_TTL} seconds")
+        
+        with self.lock:
+            room = self.get_room_by_id(room_id)
+            if not room:
+                raise ValueError(f"Room {room_id} not found")
+            
+            event = Event(0, event_name, attendees, required_equipments)
+            if not event.is_suitable_for_room(room):
+                raise ValueError(f"Room '{room.name}' is not suitable for '{event_name}'")
+            
+            if not self.is_room_available(room_id, start_date, end_date):
+                raise ValueError(f"Room '{room.name}' is not available during the requested time")
+            
+            hold = self.holds.add(room_id, event_name, attendees, required_equipments,
+                                  start_date, end_date, ttl_seconds)
+            self.availability_cache.bump(room_id)
+            print(f"✓ Hold #{hold.id} placed on '{room.name}' until {hold.expires_at:%H:%M:%S}")
+            return hold
+    
+    def get_hold(self, hold_id: int) -> Optional[Hold]:
+        """Find a hold by its ID, whatever its state."""
+        return self.holds.get(hold_id)
+    
+    def confirm_hold(self, hold_id: int) -> Optional[Booking]:
+        """Turn an active hold into a booking."""
+        hold = self.holds.get(hold_id)
+        if not hold:
+            raise ValueError(f"Hold {hold_id} not found")
+        return self.create_booking(hold.room_id, hold.event_name, hold.attendees,
+                                   hold.required_equipments, hold.start_date, hold.end_date,
+                                   hold=hold)
+    
+    def release_hold(self, hold_id: int) -> bool:
+        """Give up an active hold and offer its interval to the waitlist."""
+        with self.lock:
+            hold = self.holds.get(hold_id)
+            if not hold or hold.status != Hold.ACTIVE:
+                return False
+            self.holds.remove(hold, Hold.RELEASED)
+            self.availability_cache.bump(hold.room_id)
+            print(f"✓ Hold #{hold_id} released")
+        self.promote_waitlist(hold.room_id, hold.start_date, hold.end_date)
+        return True
+    
+    def _expire_holds(self):
+        """Background loop advancing the hold and waitlist timing wheels once per tick."""
+        tick = self.holds.wheel.tick
+        next_tick = time.monotonic() + tick
+        while True:
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+            # Catch up on the ticks missed if the loop was delayed
+            while next_tick <= time.monotonic():
+                next_tick += tick
+                with self.lock:
+                    expired = self.holds.advance()
+                    for hold in expired:
+                        self.availability_cache.bump(hold.room_id)
+                        print(f"✓ Hold #{hold.id} expired")
+                    for entry in self.waitlist.advance():
+                        print(f"✓ Waitlist entry #{entry.id} expired")
+                for hold in expired:
+                    self.promote_waitlist(hold.room_id, hold.start_date, hold.end_date)
     
     def get_room_schedule(self, room_id: int, date: datetime = None) -> List[Booking]:
         """Get all bookings for a specific room, optionally filtered by date."""
-        bookings = [b for b in self.bookings if b.room_id == room_id]
+        bookings = list(self.room_bookings.get(room_id, []))
+        
+        day_start = date.replace(hour=0, minute=0, second=0, microsecond=0) if date else None
+        if self.reaches_archive(day_start):
+            bookings += self.db.get_archived_bookings(room_id)
         
         if date:
             bookings = [b for b in bookings 
@@ -131,6 +581,40 @@ class Scheduler:
         
         return sorted(bookings, key=lambda b: b.start_date)
     
+    def get_rooms_schedule(self, room_ids: List[int] = None,
+                           start_date: datetime = None,
+                           end_date: datetime = None) -> List[Tuple[Room, List[Booking]]]:
+        """Get the schedule of several rooms at once, grouped in a single pass.
+        
+        Only bookings overlapping [start_date, end_date) are kept when a
+        bound is given. Rooms are returned in the scheduler's order.
+        """
+        if room_ids is None:
+            rooms = self.rooms
+        else:
+            wanted = set(room_ids)
+            rooms = [r for r in self.rooms if r.id in wanted]
+        
+        grouped = {room.id: [] for room in rooms}
+        for booking in self.bookings:
+            room_bookings = grouped.get(booking.room_id)
+            if room_bookings is None:
+                continue
+            if start_date and booking.end_date <= start_date:
+                continue
+            if end_date and booking.start_date >= end_date:
+                continue
+            room_bookings.append(booking)
+        
+        if self.reaches_archive(start_date):
+            for booking in self.db.get_archived_bookings(None, start_date, end_date):
+                room_bookings = grouped.get(booking.room_id)
+                if room_bookings is not None:
+                    room_bookings.append(booking)
+        
+        return [(room, sorted(grouped[room.id], key=lambda b: b.start_date))
+                for room in rooms]
+    
     def get_event_booking(self, event_id: int) -> Optional[Booking]:
         """Get the booking for a specific event."""
         return next((b for b in self.bookings if b.event_id == event_id), None)
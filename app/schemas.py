@@ -1,17 +1,29 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import AfterValidator, BaseModel, Field
+from typing import Annotated, List, Optional
 from datetime import datetime
+from app.holds import MAX_HOLD_TTL
+
+def naive_local(value: datetime) -> datetime:
+    """A date carrying a UTC offset as naive local time, the form every stored date has."""
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+# Date sent by a client: offsets are accepted and normalised so comparisons with stored dates work
+LocalDatetime = Annotated[datetime, AfterValidator(naive_local)]
 
 class RoomCreate(BaseModel):
     name: str
     capacity: int
     equipments: List[str]
+    site: str = "main"
 
 class RoomResponse(BaseModel):
     id: int
     name: str
     capacity: int
     equipments: List[str]
+    site: str
 
 class EventCreate(BaseModel):
     name: str
@@ -23,8 +35,8 @@ class BookingCreate(BaseModel):
     event_name: str
     attendees: int
     required_equipments: List[str]
-    start_date: datetime
-    end_date: datetime
+    start_date: LocalDatetime
+    end_date: LocalDatetime
 
 class BookingResponse(BaseModel):
     id: int
@@ -35,8 +47,108 @@ class BookingResponse(BaseModel):
     duration_hours: float
 
 class AvailabilityCheck(BaseModel):
+    event_name: str
+    attendees: int
+    required_equipments: List[str]
+    start_date: LocalDatetime
+    end_date: LocalDatetime
+
+class ScheduleBookingResponse(BaseModel):
+    id: int
+    event_id: int
+    start_date: datetime
+    end_date: datetime
+    duration_hours: float
+
+class RoomScheduleResponse(BaseModel):
+    room: RoomResponse
+    bookings: List[ScheduleBookingResponse]
+
+class AvailabilityResponse(BaseModel):
+    available: bool
+    rooms: List[RoomResponse]
+
+class WaitlistResponse(BaseModel):
+    id: int
+    room_id: int
+    event_name: str
+    attendees: int
+    required_equipments: List[str]
+    start_date: datetime
+    end_date: datetime
+    status: str
+    booking_id: Optional[int] = None
+
+class HoldCreate(BookingCreate):
+    ttl_seconds: Optional[int] = Field(None, gt=0, le=MAX_HOLD_TTL)
+
+class HoldResponse(BaseModel):
+    id: int
+    room_id: int
+    event_name: str
+    attendees: int
+    required_equipments: List[str]
+    start_date: datetime
+    end_date: datetime
+    expires_at: datetime
+    status: str
+    booking_id: Optional[int] = None
+
+class ScenarioCreate(BaseModel):
+    name: str
+
+class ScenarioResponse(BaseModel):
+    id: int
+    name: str
+    created_at: datetime
+    removed: int
+    added: int
+    closed_rooms: List[int]
+
+class BookingMove(BaseModel):
+    room_id: Optional[int] = None
+    start_date: Optional[LocalDatetime] = None
+    end_date: Optional[LocalDatetime] = None
+
+class ScenarioBookingResponse(BaseModel):
+    id: int
+    room_id: int
+    event_id: int
     event_name: str
     attendees: int
     required_equipments: List[str]
     start_date: datetime
-    end_date: datetime
\ No newline at end of file
+    end_date: datetime
+
+class ScenarioDiffResponse(BaseModel):
+    removed: List[BookingResponse]
+    added: List[ScenarioBookingResponse]
+    closed_rooms: List[int]
+
+class ScenarioCommitResponse(BaseModel):
+    removed_booking_ids: List[int]
+    created: List[BookingResponse]
+
+class SearchResult(BaseModel):
+    kind: str
+    id: int
+    name: str
+    equipments: List[str]
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchResult]
+    limit: int
+    offset: int
+    has_more: bool
+
+class ImportReject(BaseModel):
+    row: int
+    reason: str
+
+class ImportResponse(BaseModel):
+    rows: int
+    imported: int
+    rejected: int
+    rejects: List[ImportReject]
+    error: Optional[str] = None
@@ -0,0 +1,124 @@
+"""Full-text and prefix search over room names, equipment and event names.
+
+The index is an FTS5 table living in the booking database. `Database`
+updates it in the same transaction as the rooms/events rows it mirrors,
+so it never drifts from the data. Every query term is matched as a
+prefix (FTS5 keeps prefix indexes for 2 to 4 characters), which makes
+typeahead lookups cheap even with hundreds of thousands of events.
+
+Matches are ranked by BM25 by default. BM25 depends on the statistics
+of the whole index, so scores from different databases (one per shard,
+see app.sharding) can't be compared; the "name" ranking only looks at
+each match itself (exact name, then name prefix, then the rest, each by
+name and ID) and gives the same order however the data is split.
+"""
+import json
+import re
+import sqlite3
+from typing import List, Optional
+
+KINDS = ("room", "event")
+RANKINGS = ("bm25", "name")
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchIndex:
+    """SQL helpers for the `search_index` FTS5 table, run on a caller's cursor."""
+
+    @staticmethod
+    def create(cursor: sqlite3.Cursor):
+        """Create the index and rebuild it if it is out of step with the data."""
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+                kind UNINDEXED,
+                ref_id UNINDEXED,
+                name,
+                equipments,
+                prefix = '2 3 4',
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+        ''')
+        cursor.execute('''
+            SELECT (SELECT COUNT(*) FROM rooms) + (SELECT COUNT(*) FROM events)
+                 - (SELECT COUNT(*) FROM search_index) AS missing
+        ''')
+        if cursor.fetchone()[0] != 0:
+            SearchIndex.rebuild(cursor)
+
+    @staticmethod
+    def rebuild(cursor: sqlite3.Cursor):
+        """Re-index every room and event."""
+        cursor.execute('DELETE FROM search_index')
+        cursor.execute('''
+            INSERT INTO search_index (kind, ref_id, name, equipments)
+            SELECT 'room', id, name, equipments FROM rooms
+        ''')
+        cursor.execute('''
+            INSERT INTO search_index (kind, ref_id, name, equipments)
+            SELECT 'event', id, name, required_equipments FROM events
+        ''')
+
+    @staticmethod
+    def index(cursor: sqlite3.Cursor, kind: str, ref_id: int, name: str,
+              equipments: List[str]):
+        """Insert or refresh the entry of one room or event."""
+        cursor.execute('DELETE FROM search_index WHERE kind = ? AND ref_id = ?', (kind, ref_id))
+        cursor.execute('''
+            INSERT INTO search_index (kind, ref_id, name, equipments)
+            VALUES (?, ?, ?, ?)
+        ''', (kind, ref_id, name, json.dumps(equipments)))
+
+    @staticmethod
+    def sort_key(result: dict) -> tuple:
+        """Order of the results of `search`, to merge result lists of several databases."""
+        return result["score"], result["name"], result["kind"], result["id"]
+
+    @staticmethod
+    def match_expression(query: str) -> Optional[str]:
+        """FTS5 expression matching every word of the query as a prefix."""
+        tokens = _TOKEN.findall(query)
+        if not tokens:
+            return None
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    @staticmethod
+    def search(cursor: sqlite3.Cursor, query: str, kind: str = None,
+               limit: int = 20, offset: int = 0, ranking: str = "bm25") -> List[dict]:
+        """Best matches first: lower score is better, ties in the order of `sort_key`."""
+        if ranking not in RANKINGS:
+            raise ValueError(f"Unknown ranking '{ranking}', expected one of {list(RANKINGS)}")
+        expression = SearchIndex.match_expression(query)
+        if expression is None:
+            return []
+
+        if ranking == "bm25":
+            score, params = 'bm25(search_index)', []
+        else:
+            # 0: whole name equals the query, 1: name starts with it, 2: other matches
+            needle = query.strip()
+            score = '''CASE WHEN lower(name) = lower(?) THEN 0
+                            WHEN lower(substr(name, 1, length(?))) = lower(?) THEN 1
+                            ELSE 2 END'''
+            params = [needle, needle, needle]
+        sql = f'''
+            SELECT kind, ref_id, name, equipments, {score} AS score
+            FROM search_index WHERE search_index MATCH ?
+        '''
+        params.append(expression)
+        if kind:
+            sql += ' AND kind = ?'
+            params.append(kind)
+        sql += ' ORDER BY score, name, kind, CAST(ref_id AS INTEGER) LIMIT ? OFFSET ?'
+        params += [limit, offset]
+
+        cursor.execute(sql, params)
+        return [
+            {
+                "kind": row[0],
+                "id": row[1],
+                "name": row[2],
+                "equipments": json.loads(row[3]),
+                "score": row[4]
+            }
+            for row in cursor.fetchall()
+        ]
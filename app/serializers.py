@@ -0,0 +1,89 @@
+import orjson
+from typing import Callable, Iterable, List, TypeVar
+from fastapi import Response
+from app.models import Room, Booking
+
+T = TypeVar("T")
+
+
+def room_to_dict(room: Room) -> dict:
+    """Convert a room to its RoomResponse representation."""
+    return {
+        "id": room.id,
+        "name": room.name,
+        "capacity": room.capacity,
+        "equipments": room.equipments,
+        "site": room.site
+    }
+
+
+def booking_to_dict(booking: Booking) -> dict:
+    """Convert a booking to its BookingResponse representation."""
+    return {
+        "id": booking.id,
+        "room_id": booking.room_id,
+        "event_id": booking.event_id,
+        "start_date": booking.start_date,
+        "end_date": booking.end_date,
+        "duration_hours": booking.duration_hours()
+    }
+
+
+def schedule_booking_to_dict(booking: Booking) -> dict:
+    """Convert a booking to its ScheduleBookingResponse representation."""
+    return {
+        "id": booking.id,
+        "event_id": booking.event_id,
+        "start_date": booking.start_date,
+        "end_date": booking.end_date,
+        "duration_hours": booking.duration_hours()
+    }
+
+
+def _cached(obj, variant: str, to_dict: Callable) -> bytes:
+    """Return the cached JSON encoding of an object, encoding it on a miss.
+
+    The cache lives on the object itself and is dropped by the models'
+    __setattr__ whenever a field is reassigned.
+    """
+    encoded = obj.__dict__.get("_encoded")
+    if encoded is None:
+        encoded = {}
+        obj._encoded = encoded
+    data = encoded.get(variant)
+    if data is None:
+        data = orjson.dumps(to_dict(obj))
+        encoded[variant] = data
+    return data
+
+
+def encode_room(room: Room) -> bytes:
+    """Encode a room to JSON bytes."""
+    return _cached(room, "room", room_to_dict)
+
+
+def encode_booking(booking: Booking) -> bytes:
+    """Encode a booking to JSON bytes."""
+    return _cached(booking, "booking", booking_to_dict)
+
+
+def encode_schedule_booking(booking: Booking) -> bytes:
+    """Encode a booking as it appears inside a room schedule."""
+    return _cached(booking, "schedule", schedule_booking_to_dict)
+
+
+def encode_list(items: Iterable[T], encode: Callable[[T], bytes]) -> bytes:
+    """Encode a sequence of objects into a JSON array."""
+    return b"[" + b",".join(encode(item) for item in items) + b"]"
+
+
+def encode_schedule(room: Room, bookings: List[Booking]) -> bytes:
+    """Encode a room and its bookings as a RoomScheduleResponse."""
+    return (b'{"room":' + encode_room(room) +
+            b',"bookings":' + encode_list(bookings, encode_schedule_booking) + b"}")
+
+
+def json_response(content: bytes, status_code: int = 200) -> Response:
+    """Wrap pre-encoded JSON so FastAPI sends it without re-validation."""
+    return Response(content=content, status_code=status_code,
+                    media_type="application/json")
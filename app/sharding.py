@@ -0,0 +1,442 @@
+"""Sharding of the scheduler by site.
+
+Each site (campus or building) is served by its own worker process that
+owns a `Scheduler` backed by its own SQLite file, so writes to different
+sites no longer serialise on a single database. `ShardRouter` exposes
+the subset of the `Scheduler` interface used by the API: calls about a
+single room or booking go to the owning shard, while listings and
+availability searches fan out to every shard in parallel and are merged.
+
+IDs stay globally unique: shard `i` allocates room, event, booking and
+waitlist IDs from `i * SHARD_ID_SPAN + 1`, so the owner of any ID is
+`id // SHARD_ID_SPAN`.
+
+An existing single-process database must be split into the site files
+before switching to sharded mode; `ShardRouter` refuses to start while
+the base file still holds rooms or bookings. Splitting copies each
+room, with its bookings (live and archived) and their events, to the
+file of its site, shifting every ID by the shard's offset (the first
+site keeps its IDs). The base file is then renamed with a `.split`
+suffix.
+
+Usage:
+    python -m app.sharding --db booking_system.db --sites nord,sud
+"""
+import argparse
+import itertools
+import multiprocessing
+import os
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.database import Database
+from app.models import Room, Event, Booking
+from app.scheduler import DEFAULT_HOLD_TTL, Scheduler
+from app.waitlist import WaitlistEntry
+from app.holds import Hold
+from app.search import SearchIndex
+
+SHARD_ID_SPAN = 10 ** 9
+
+
+def shard_db_path(db_path: str, site: str) -> str:
+    """Database file of a site, derived from the base path: booking_system.<site>.db."""
+    root, ext = os.path.splitext(db_path)
+    return f"{root}.{site}{ext or '.db'}"
+
+
+def stored_rows(db_path: str) -> int:
+    """Rooms and bookings (live or archived) in a database file, 0 if there is no file."""
+    if not os.path.exists(db_path):
+        return 0
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        return sum(conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                   for table in ('rooms', 'bookings', 'archived_bookings') if table in tables)
+    finally:
+        conn.close()
+
+
+def split_database(db_path: str, sites: List[str]) -> Dict[str, int]:
+    """Distribute an unsharded database into one file per site; returns the rooms copied per site.
+
+    Fails with ValueError, before writing anything, if a room belongs to
+    none of the sites or a site file already holds data. Events that no
+    booking refers to go to the first site.
+    """
+    if not sites:
+        raise ValueError("At least one site is required")
+    # Bring files created by older versions up to the current schema
+    Database(db_path)
+    source = sqlite3.connect(db_path)
+    try:
+        stored_sites = {row[0] for row in source.execute('SELECT DISTINCT site FROM rooms')}
+    finally:
+        source.close()
+    unknown = sorted(stored_sites - set(sites))
+    if unknown:
+        raise ValueError(f"Rooms of sites {unknown} have no shard, expected one of {sites}")
+    for site in sites:
+        if stored_rows(shard_db_path(db_path, site)):
+            raise ValueError(f"{shard_db_path(db_path, site)} already holds data")
+
+    # (room_id, event_id) of every live and archived booking of the source
+    all_bookings = '''
+        SELECT room_id, event_id FROM source.bookings
+        UNION ALL SELECT room_id, event_id FROM source.archived_bookings
+    '''
+    copied = {}
+    for index, site in enumerate(sites):
+        target_path = shard_db_path(db_path, site)
+        offset = index * SHARD_ID_SPAN
+        Database(target_path, offset)
+        conn = sqlite3.connect(target_path)
+        try:
+            conn.execute('ATTACH DATABASE ? AS source', (db_path,))
+            conn.execute('''
+                INSERT INTO rooms (id, name, capacity, equipments, site)
+                SELECT id + ?, name, capacity, equipments, site FROM source.rooms WHERE site = ?
+            ''', (offset, site))
+            conn.execute(f'''
+                INSERT INTO events (id, name, attendees, required_equipments)
+                SELECT id + ?, name, attendees, required_equipments FROM source.events
+                WHERE id IN (SELECT b.event_id FROM ({all_bookings}) b
+                             JOIN source.rooms r ON r.id = b.room_id WHERE r.site = ?)
+                   OR (? AND id NOT IN (SELECT event_id FROM ({all_bookings})))
+            ''', (offset, site, index == 0))
+            for table in ('bookings', 'archived_bookings'):
+                conn.execute(f'''
+                    INSERT INTO {table} (id, room_id, event_id, start_date, end_date)
+                    SELECT b.id + ?, b.room_id + ?, b.event_id + ?, b.start_date, b.end_date
+                    FROM source.{table} b JOIN source.rooms r ON r.id = b.room_id
+                    WHERE r.site = ?
+                ''', (offset, offset, offset, site))
+            SearchIndex.rebuild(conn.cursor())
+            conn.commit()
+            copied[site] = conn.execute('SELECT COUNT(*) FROM rooms').fetchone()[0]
+        finally:
+            conn.close()
+
+    os.replace(db_path, f"{db_path}.split")
+    return copied
+
+
+def _serve(db_path: str, id_offset: int, conn):
+    """Worker process main loop: run requested Scheduler methods and send back results.
+
+    Requests are handled in a thread pool so a slow call (e.g. a write waiting
+    for its group commit) does not block the shard; the scheduler lock still
+    serialises writes.
+    """
+    scheduler = Scheduler(db_path, id_offset)
+    send_lock = threading.Lock()
+
+    def handle(request_id, method, args, kwargs):
+        try:
+            attribute = getattr(scheduler, method)
+            result = attribute(*args, **kwargs) if callable(attribute) else attribute
+            reply = (request_id, True, result)
+        except Exception as e:
+            reply = (request_id, False, e)
+        with send_lock:
+            conn.send(reply)
+
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                break
+            if message is None:
+                break
+            executor.submit(handle, *message)
+
+
+class ShardClient:
+    """Handle on one shard worker process."""
+
+    def __init__(self, site: str, index: int, db_path: str):
+        self.site = site
+        self.index = index
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_serve, args=(db_path, index * SHARD_ID_SPAN, child_conn),
+            name=f"shard-{site}", daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+        self._send_lock = threading.Lock()
+        self._pending: Dict[int, Future] = {}
+        self._request_ids = itertools.count()
+        self._receiver = threading.Thread(target=self._receive, name=f"shard-{site}-receiver",
+                                          daemon=True)
+        self._receiver.start()
+
+    def _receive(self):
+        """Resolve pending calls as replies come back from the worker."""
+        while True:
+            try:
+                request_id, ok, result = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            future = self._pending.pop(request_id)
+            if ok:
+                future.set_result(result)
+            else:
+                future.set_exception(result)
+
+        error = RuntimeError(f"Shard '{self.site}' is not running")
+        for future in list(self._pending.values()):
+            future.set_exception(error)
+
+    def submit(self, method: str, *args, **kwargs) -> Future:
+        """Send a call to the worker without waiting for its result."""
+        future = Future()
+        with self._send_lock:
+            request_id = next(self._request_ids)
+            self._pending[request_id] = future
+            self._conn.send((request_id, method, args, kwargs))
+        return future
+
+    def call(self, method: str, *args, **kwargs):
+        """Run a Scheduler method (or read an attribute) in the worker."""
+        return self.submit(method, *args, **kwargs).result()
+
+    def close(self):
+        """Stop the worker process."""
+        with self._send_lock:
+            self._conn.send(None)
+        self.process.join(timeout=5)
+
+
+class ShardRouter:
+    """Routes scheduler calls to per-site shard processes."""
+
+    def __init__(self, sites: List[str], db_path: str = "booking_system.db"):
+        if not sites:
+            raise ValueError("At least one site is required")
+        if stored_rows(db_path):
+            raise RuntimeError(f"{db_path} holds unsharded data: split it into site files first "
+                               f"with `python -m app.sharding --db {db_path} --sites {','.join(sites)}`")
+        self.shards = [ShardClient(site, index, shard_db_path(db_path, site))
+                       for index, site in enumerate(sites)]
+        self.shards_by_site = {shard.site: shard for shard in self.shards}
+        self.db_paths = [shard_db_path(db_path, site) for site in sites]
+
+    def close(self):
+        """Stop every shard worker."""
+        for shard in self.shards:
+            shard.close()
+
+    # ---------- Routing helpers ----------
+
+    def shard_for_id(self, object_id: int) -> Optional[ShardClient]:
+        """Shard owning a room, booking or waitlist entry ID."""
+        index = object_id // SHARD_ID_SPAN
+        return self.shards[index] if 0 <= index < len(self.shards) else None
+
+    def shard_for_site(self, site: str) -> ShardClient:
+        shard = self.shards_by_site.get(site)
+        if shard is None:
+            raise ValueError(f"Unknown site '{site}', expected one of {list(self.shards_by_site)}")
+        return shard
+
+    def fan_out(self, method: str, *args, **kwargs) -> list:
+        """Call a method on every shard in parallel and return the results in shard order."""
+        futures = [shard.submit(method, *args, **kwargs) for shard in self.shards]
+        return [future.result() for future in futures]
+
+    def fan_out_concat(self, method: str, *args, **kwargs) -> list:
+        """Fan out a method returning a list and concatenate the results."""
+        return [item for result in self.fan_out(method, *args, **kwargs) for item in result]
+
+    # ---------- Scheduler interface ----------
+
+    def add_room(self, room: Room) -> Room:
+        saved = self.shard_for_site(room.site).call("add_room", room)
+        room.id = saved.id
+        return room
+
+    def get_room_by_id(self, room_id: int) -> Optional[Room]:
+        shard = self.shard_for_id(room_id)
+        return shard.call("get_room_by_id", room_id) if shard else None
+
+    def get_all_rooms(self) -> List[Room]:
+        return self.fan_out_concat("get_all_rooms")
+
+    def get_all_bookings(self, include_archived: bool = False) -> List[Booking]:
+        return self.fan_out_concat("get_all_bookings", include_archived)
+
+    def get_booking(self, booking_id: int) -> Optional[Booking]:
+        shard = self.shard_for_id(booking_id)
+        return shard.call("get_booking", booking_id) if shard else None
+
+    def get_room_bookings(self, room_id: int, include_archived: bool = False) -> List[Booking]:
+        shard = self.shard_for_id(room_id)
+        return shard.call("get_room_bookings", room_id, include_archived) if shard else []
+
+    def find_available_rooms(self, event: Event, start_date: datetime,
+                             end_date: datetime, limit: int = None,
+                             order: str = "id", exclude_hold_id: int = None) -> List[Room]:
+        # Each shard returns its own first `limit` rooms; merge them in the requested order
+        rooms = self.fan_out_concat("find_available_rooms", event, start_date, end_date,
+                                    limit, order, exclude_hold_id)
+        if order == "best_fit":
+            rooms.sort(key=lambda room: (room.capacity, room.id))
+        return rooms if limit is None else rooms[:limit]
+
+    def is_room_available(self, room_id: int, start_date: datetime,
+                          end_date: datetime, exclude_booking_id: int = None) -> bool:
+        shard = self.shard_for_id(room_id)
+        if shard is None:
+            return False
+        return shard.call("is_room_available", room_id, start_date, end_date, exclude_booking_id)
+
+    def check_room_availability(self, room_id: int, start_date: datetime,
+                                end_date: datetime) -> bool:
+        shard = self.shard_for_id(room_id)
+        return shard.call("check_room_availability", room_id, start_date, end_date) if shard else False
+
+    def create_booking(self, room_id: int, event_name: str, attendees: int,
+                       required_equipments: List[str], start_date: datetime,
+                       end_date: datetime) -> Optional[Booking]:
+        shard = self.shard_for_id(room_id)
+        if shard is None:
+            return None
+        return shard.call("create_booking", room_id, event_name, attendees,
+                          required_equipments, start_date, end_date)
+
+    def import_rooms(self, rooms: List[Room], rows: List[int] = None) -> List[tuple]:
+        rejects = []
+        by_site: Dict[str, List[Room]] = {}
+        for row, room in zip(rows or range(1, len(rooms) + 1), rooms):
+            if room.site not in self.shards_by_site:
+                rejects.append((row, f"Unknown site '{room.site}', "
+                                     f"expected one of {list(self.shards_by_site)}"))
+                continue
+            by_site.setdefault(room.site, []).append(room)
+        futures = [(self.shards_by_site[site].submit("add_rooms", site_rooms), site_rooms)
+                   for site, site_rooms in by_site.items()]
+        for future, site_rooms in futures:
+            for room, saved in zip(site_rooms, future.result()):
+                room.id = saved.id
+        return rejects
+
+    def import_bookings(self, requests: List[dict]) -> List[tuple]:
+        rejects = []
+        by_shard: Dict[int, List[dict]] = {}
+        for request in requests:
+            shard = self.shard_for_id(request["room_id"])
+            if shard is None:
+                rejects.append((request["row"], f"Room {request['room_id']} not found"))
+                continue
+            by_shard.setdefault(shard.index, []).append(request)
+        futures = [self.shards[index].submit("import_bookings", shard_requests)
+                   for index, shard_requests in by_shard.items()]
+        for future in futures:
+            rejects += future.result()
+        return rejects
+
+    def cancel_booking(self, booking_id: int) -> bool:
+        shard = self.shard_for_id(booking_id)
+        return shard.call("cancel_booking", booking_id) if shard else False
+
+    def remove_bookings(self, booking_ids: List[int]) -> int:
+        by_shard: Dict[int, List[int]] = {}
+        for booking_id in booking_ids:
+            shard = self.shard_for_id(booking_id)
+            if shard is not None:
+                by_shard.setdefault(shard.index, []).append(booking_id)
+        futures = [self.shards[index].submit("remove_bookings", ids)
+                   for index, ids in by_shard.items()]
+        return sum(future.result() for future in futures)
+
+    def get_room_schedule(self, room_id: int, date: datetime = None) -> List[Booking]:
+        shard = self.shard_for_id(room_id)
+        return shard.call("get_room_schedule", room_id, date) if shard else []
+
+    def get_rooms_schedule(self, room_ids: List[int] = None, start_date: datetime = None,
+                           end_date: datetime = None) -> list:
+        return self.fan_out_concat("get_rooms_schedule", room_ids, start_date, end_date)
+
+    def search(self, query: str, kind: str = None, limit: int = 20,
+               offset: int = 0) -> List[dict]:
+        # BM25 scores of separate indexes can't be compared: rank by name match instead,
+        # so each shard's best limit + offset hits merge into the same order on any split
+        results = self.fan_out_concat("search", query, kind, limit + offset, 0, "name")
+        results.sort(key=SearchIndex.sort_key)
+        return results[offset:offset + limit]
+
+    def archive_bookings_before(self, cutoff: datetime) -> int:
+        return sum(self.fan_out("archive_bookings_before", cutoff))
+
+    @property
+    def archive_watermark(self) -> Optional[datetime]:
+        watermarks = [w for w in self.fan_out("archive_watermark") if w]
+        return max(watermarks, default=None)
+
+    def place_hold(self, room_id: int, event_name: str, attendees: int,
+                   required_equipments: List[str], start_date: datetime,
+                   end_date: datetime, ttl_seconds: float = DEFAULT_HOLD_TTL) -> Hold:
+        shard = self.shard_for_id(room_id)
+        if shard is None:
+            raise ValueError(f"Room {room_id} not found")
+        return shard.call("place_hold", room_id, event_name, attendees, required_equipments,
+                          start_date, end_date, ttl_seconds)
+
+    def get_hold(self, hold_id: int) -> Optional[Hold]:
+        shard = self.shard_for_id(hold_id)
+        return shard.call("get_hold", hold_id) if shard else None
+
+    def confirm_hold(self, hold_id: int) -> Optional[Booking]:
+        shard = self.shard_for_id(hold_id)
+        if shard is None:
+            raise ValueError(f"Hold {hold_id} not found")
+        return shard.call("confirm_hold", hold_id)
+
+    def release_hold(self, hold_id: int) -> bool:
+        shard = self.shard_for_id(hold_id)
+        return shard.call("release_hold", hold_id) if shard else False
+
+    def join_waitlist(self, room_id: int, event_name: str, attendees: int,
+                      required_equipments: List[str], start_date: datetime,
+                      end_date: datetime) -> WaitlistEntry:
+        shard = self.shard_for_id(room_id)
+        if shard is None:
+            raise ValueError(f"Room {room_id} not found")
+        return shard.call("join_waitlist", room_id, event_name, attendees,
+                          required_equipments, start_date, end_date)
+
+    def get_waitlist_entry(self, entry_id: int) -> Optional[WaitlistEntry]:
+        shard = self.shard_for_id(entry_id)
+        return shard.call("get_waitlist_entry", entry_id) if shard else None
+
+    def get_room_waitlist(self, room_id: int) -> List[WaitlistEntry]:
+        shard = self.shard_for_id(room_id)
+        return shard.call("get_room_waitlist", room_id) if shard else []
+
+    def leave_waitlist(self, entry_id: int) -> bool:
+        shard = self.shard_for_id(entry_id)
+        return shard.call("leave_waitlist", entry_id) if shard else False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split a single-process database into per-site shard files")
+    parser.add_argument("--db", default="booking_system.db")
+    parser.add_argument("--sites", required=True, help="comma-separated sites, in BOOKING_SHARDS order")
+    args = parser.parse_args()
+
+    sites = [site.strip() for site in args.sites.split(",") if site.strip()]
+    for site, rooms in split_database(args.db, sites).items():
+        print(f"✓ {shard_db_path(args.db, site)}: {rooms} rooms")
+    print(f"✓ {args.db} moved to {args.db}.split")
+
+
+if __name__ == "__main__":
+    main()
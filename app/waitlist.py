@@ -0,0 +1,138 @@
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from app.holds import TimingWheel
+
+# How long resolved entries stay readable before they are forgotten
+RESOLVED_RETENTION_SECONDS = 600
+
+
+class WaitlistEntry:
+    """A booking request queued until its room frees up."""
+
+    WAITING = "waiting"
+    PROMOTED = "promoted"
+    CANCELLED = "cancelled"
+    EXPIRED = "expired"
+
+    def __init__(self, id: int, room_id: int, event_name: str, attendees: int,
+                 required_equipments: List[str], start_date: datetime, end_date: datetime):
+        self.id = id
+        self.room_id = room_id
+        self.event_name = event_name
+        self.attendees = attendees
+        self.required_equipments = required_equipments
+        self.start_date = start_date
+        self.end_date = end_date
+        self.status = self.WAITING
+        self.booking_id = None
+
+        if start_date >= end_date:
+            raise ValueError("Start date must be before end date")
+
+    def resolve(self, status: str, booking_id: int = None):
+        """Move the entry to a final state."""
+        self.status = status
+        self.booking_id = booking_id
+
+    def __repr__(self):
+        return (f"WaitlistEntry(id={self.id}, room_id={self.room_id}, "
+                f"start_date={self.start_date}, end_date={self.end_date}, status='{self.status}')")
+
+
+class Waitlist:
+    """Waiting booking requests, indexed per room by start date.
+
+    Entries of a room are kept sorted by (start_date, id), so the entries
+    overlapping a freed interval are found by bisecting on its end instead
+    of scanning the whole queue. A timing wheel expires entries whose
+    start date passes while they wait, then forgets resolved entries once
+    they have been readable for `RESOLVED_RETENTION_SECONDS`.
+
+    Callers are expected to hold the scheduler lock and to call `advance`
+    once per wheel tick.
+    """
+
+    def __init__(self, first_id: int = 1, tick: float = 1.0):
+        self.entries: Dict[int, WaitlistEntry] = {}
+        self._by_room: Dict[int, List[tuple]] = {}
+        self.wheel = TimingWheel(tick)
+        # Entries taken out of the queue while their promotion is written
+        self._claimed: Set[int] = set()
+        self._next_id = first_id
+
+    def add(self, room_id: int, event_name: str, attendees: int,
+            required_equipments: List[str], start_date: datetime,
+            end_date: datetime) -> WaitlistEntry:
+        """Queue a new request and return its entry."""
+        entry = WaitlistEntry(self._next_id, room_id, event_name, attendees,
+                              required_equipments, start_date, end_date)
+        self._next_id += 1
+        self.entries[entry.id] = entry
+        insort(self._by_room.setdefault(room_id, []), (start_date, entry.id))
+        self.wheel.schedule(entry.id, (start_date - datetime.now()).total_seconds())
+        return entry
+
+    def get(self, entry_id: int) -> Optional[WaitlistEntry]:
+        """Find an entry by its ID, whatever its state."""
+        return self.entries.get(entry_id)
+
+    def claim(self, entry: WaitlistEntry):
+        """Take a waiting entry out of the queue, still unresolved, while it is being promoted."""
+        self._unqueue(entry)
+        self._claimed.add(entry.id)
+
+    def is_claimed(self, entry: WaitlistEntry) -> bool:
+        """Whether an entry is out of the queue for promotion."""
+        return entry.id in self._claimed
+
+    def requeue(self, entry: WaitlistEntry):
+        """Put back a claimed entry whose promotion failed."""
+        self._claimed.discard(entry.id)
+        insort(self._by_room.setdefault(entry.room_id, []), (entry.start_date, entry.id))
+        self.wheel.schedule(entry.id, (entry.start_date - datetime.now()).total_seconds())
+
+    def remove(self, entry: WaitlistEntry, status: str, booking_id: int = None):
+        """Take a waiting (or claimed) entry out of the queue and resolve it."""
+        self._unqueue(entry)
+        self._claimed.discard(entry.id)
+        entry.resolve(status, booking_id)
+        # Its timeout now means forgetting the entry
+        self.wheel.schedule(entry.id, RESOLVED_RETENTION_SECONDS)
+
+    def advance(self) -> List[WaitlistEntry]:
+        """Advance the wheel one tick, expire the entries that are due and forget old ones."""
+        expired = []
+        for entry_id in self.wheel.advance():
+            entry = self.entries[entry_id]
+            if entry.id in self._claimed:
+                # Its promotion decides; look again on the next tick
+                self.wheel.schedule(entry_id, self.wheel.tick)
+            elif entry.status == WaitlistEntry.WAITING:
+                self.remove(entry, WaitlistEntry.EXPIRED)
+                expired.append(entry)
+            else:
+                del self.entries[entry_id]
+        return expired
+
+    def room_entries(self, room_id: int) -> List[WaitlistEntry]:
+        """Waiting entries of a room in arrival order."""
+        keys = self._by_room.get(room_id, [])
+        return sorted((self.entries[entry_id] for _, entry_id in keys), key=lambda e: e.id)
+
+    def overlapping(self, room_id: int, start_date: datetime,
+                    end_date: datetime) -> List[WaitlistEntry]:
+        """Waiting entries of a room overlapping [start_date, end_date), in arrival order."""
+        keys = self._by_room.get(room_id, [])
+        # Only entries starting before end_date can overlap the interval
+        stop = bisect_left(keys, (end_date,))
+        overlapping = [self.entries[entry_id] for _, entry_id in keys[:stop]]
+        overlapping = [e for e in overlapping if e.end_date > start_date]
+        return sorted(overlapping, key=lambda e: e.id)
+
+    def _unqueue(self, entry: WaitlistEntry):
+        keys = self._by_room.get(entry.room_id, [])
+        index = bisect_left(keys, (entry.start_date, entry.id))
+        if index < len(keys) and keys[index][1] == entry.id:
+            del keys[index]
@@ -0,0 +1,73 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Tuple
+
+from app.database import Database
+from app.models import Event, Booking
+
+
+class GroupCommitWriter:
+    """Dedicated writer thread committing event/booking inserts in groups.
+
+    Concurrent requests hand their (event, booking) pair to the writer and
+    block until it is durable. The writer gathers whatever arrives within
+    `max_delay` seconds (up to `max_batch` pairs) and writes the whole group
+    in a single transaction, so one fsync is shared by every caller in the
+    group instead of two per booking.
+    """
+
+    def __init__(self, db: Database, max_delay: float = 0.002, max_batch: int = 256):
+        self.db = db
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="group-commit-writer",
+                                        daemon=True)
+        self._thread.start()
+
+    def submit(self, event: Event, booking: Booking) -> Future:
+        """Queue a pair for the next group; the future resolves once it is committed."""
+        future = Future()
+        self._queue.put((event, booking, future))
+        return future
+
+    def write(self, event: Event, booking: Booking):
+        """Write a pair and wait for its group to commit. IDs are set on both objects."""
+        self.submit(event, booking).result()
+
+    def close(self):
+        """Commit what is pending and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        running = True
+        while running:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+            self._commit(batch)
+
+    def _commit(self, batch: List[Tuple[Event, Booking, Future]]):
+        try:
+            self.db.save_events_and_bookings([(event, booking) for event, booking, _ in batch])
+        except Exception as e:
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        for _, _, future in batch:
+            future.set_result(None)
@@ -1,5 +1,8 @@
 import streamlit as st
-from datetime import time
+import numpy as np
+import requests
+from datetime import date, datetime, time, timedelta
+from config import API_URL
 
 #sample data
 rooms = [
@@ -44,5 +47,43 @@ else:
             st.write(f"**Equipment:** {', '.join(room['equipment'])}")
 
 
+st.subheader("Campus occupancy", text_alignment="center")
+
+#rooms x time slots, computed by the API in one call
+left, middle, right = st.columns(3)
+heatmapStart = left.date_input("From", date.today())
+heatmapDays = middle.number_input("Days", min_value=1, max_value=31, value=7)
+binMinutes = right.selectbox("Slot size (minutes)", [15, 30, 60, 120, 240], index=2)
+
+heatmapFrom = datetime.combine(heatmapStart, time(0, 0))
+try:
+    response = requests.get(
+        f"{API_URL}/occupancy",
+        params={
+            "start_date": heatmapFrom.isoformat(),
+            "end_date": (heatmapFrom + timedelta(days=int(heatmapDays))).isoformat(),
+            "bin_minutes": binMinutes,
+            "format": "raw",
+        },
+        timeout=30,
+    )
+except requests.RequestException:
+    response = None
+
+if response is not None and response.status_code == 200:
+    roomCount, binCount = map(int, response.headers["X-Occupancy-Shape"].split(","))
+    occupancy = np.frombuffer(response.content, dtype=np.uint8).reshape(roomCount, binCount)
+    if roomCount == 0:
+        st.info("No rooms yet")
+    else:
+        #one row per room (by ID), one column per slot: darker = more booked
+        st.image(255 - (occupancy.astype(np.uint16) * 255 // 100).astype(np.uint8),
+                 width="stretch", clamp=True)
+        st.caption(f"{roomCount} rooms x {binCount} slots of {binMinutes} min, "
+                   f"average occupancy {occupancy.mean():.1f}%")
+else:
+    st.warning("Occupancy is unavailable: is the API running?")
+
+
 if st.button("Book a Room"):
     st.session_state.page = ("reviewAvailable.py")
\ No newline at end of file
@@ -35,19 +35,61 @@ endDate = st.date_input("End date", datetime.date(2026, 6, 7))
 
 st.header("Available rooms", divider=True)
 
-#this is placeholder
+equipments = [eq.strip() for eq in requiredEqiup.split(",") if eq.strip()]
+event_payload = {
+    "event_name": name,
+    "attendees": int(attendees),
+    "required_equipments": equipments,
+    "start_date": startDate.isoformat(),
+    "end_date": endDate.isoformat(),
+}
+
+#smallest fitting rooms first, our own hold doesn't make its room unavailable
 available_rooms = []
+if name and attendees > 0 and startDate < endDate:
+    params = {"order": "best_fit", "limit": 20}
+    if st.session_state.get("hold_id"):
+        params["exclude_hold_id"] = st.session_state["hold_id"]
+    response = requests.post(
+        f"{API_BASE}/availability/check",
+        params=params,
+        json=event_payload,
+    )
+    if response.status_code == 200:
+        available_rooms = response.json()["rooms"]
+
+#keep the held room selected
+held_room_id = st.session_state["hold_key"][0] if st.session_state.get("hold_id") else None
+held_index = next((i for i, r in enumerate(available_rooms) if r["id"] == held_room_id), 0)
 
+option = None
 if available_rooms:
     option = st.selectbox(
         "Select an available room",
         available_rooms,
+        index=held_index,
         format_func=lambda r: f"Room {r['id']} | cap: {r['capacity']} | {', '.join(r['equipments'])}"
     )
 
     df = pd.DataFrame(available_rooms)
     st.dataframe(df, use_container_width=True)
 
+#hold the selected room while the form is completed, so nobody else takes it
+hold_key = (option["id"], name, int(attendees), startDate, endDate) if option else None
+if st.session_state.get("hold_key") != hold_key:
+    if st.session_state.get("hold_id"):
+        requests.delete(f"{API_BASE}/holds/{st.session_state['hold_id']}")
+    st.session_state["hold_id"] = None
+    st.session_state["hold_key"] = hold_key
+    if option:
+        response = requests.post(f"{API_BASE}/holds", json={"room_id": option["id"], **event_payload})
+        if response.status_code == 201:
+            st.session_state["hold_id"] = response.json()["id"]
+
+if st.session_state.get("hold_id"):
+    hold = requests.get(f"{API_BASE}/holds/{st.session_state['hold_id']}").json()
+    st.info(f"Room {hold['room_id']} is held for you until {hold['expires_at'][11:19]}")
+
 
 #st.write(available_rooms[50])
 
@@ -55,10 +97,6 @@ if available_rooms:
 #time
 #capasity
 
-option = st.selectbox(
-    "Select an available room",
-    available_rooms,
-)
 if option == None:
     st.warning("Please select a room")
     errors = True
@@ -93,21 +131,18 @@ if left.button("Go back", width="stretch", type='primary'):
 
 
 if right.button("Continue", type="primary", width="stretch") and not errors and available_rooms:
-    booking_payload = {
-        "room_id": option["id"],
-        "event_name": name,
-        "attendees": int(attendees),
-        "required_equipments": option["equipments"],
-        "start_date": startDate.isoformat(),
-        "end_date": endDate.isoformat(),
-    }
-
-    response = requests.post(
-        f"{API_BASE}/bookings",
-        json=booking_payload,
-    )
+    if st.session_state.get("hold_id"):
+        #confirm the hold into a booking
+        response = requests.post(f"{API_BASE}/holds/{st.session_state['hold_id']}/confirm")
+    else:
+        booking_payload = {"room_id": option["id"], **event_payload}
+        response = requests.post(
+            f"{API_BASE}/bookings",
+            json=booking_payload,
+        )
 
     if response.status_code == 201:
+        st.session_state["hold_id"] = None
         st.success("Booking created successfully")
         st.json(response.json())
     else:
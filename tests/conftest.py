@@ -0,0 +1,37 @@
+import os
+import tempfile
+
+import pytest
+
+# app.main opens its database on import: keep it away from the repository's booking_system.db
+os.environ.setdefault("BOOKING_DB_PATH", os.path.join(tempfile.mkdtemp(), "booking_system.db"))
+
+from datetime import datetime  # noqa: E402
+
+from app.models import Room  # noqa: E402
+from app.scheduler import Scheduler  # noqa: E402
+
+START = datetime(2030, 1, 1, 9, 0)
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    """Scheduler on a temporary database, with one room (ID 1, capacity 50)."""
+    scheduler = Scheduler(str(tmp_path / "booking_system.db"))
+    scheduler.add_room(Room(0, "Room A", 50, []))
+    return scheduler
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """API test client on a fresh, single-process scheduler."""
+    from fastapi.testclient import TestClient
+
+    from app import main
+    from app.scenarios import ScenarioManager
+
+    scheduler = Scheduler(str(tmp_path / "api.db"))
+    monkeypatch.setattr(main, "scheduler", scheduler)
+    monkeypatch.setattr(main, "scenarios", ScenarioManager(scheduler))
+    monkeypatch.setattr(main.archiver, "scheduler", scheduler)
+    return TestClient(main.app)
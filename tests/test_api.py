@@ -0,0 +1,60 @@
+import pyarrow as pa
+
+from app.importer import DEFAULT_CHUNK_SIZE
+
+ROOM = {"name": "Room A", "capacity": 50, "equipments": []}
+BOOKING = {"room_id": 1, "event_name": "Event", "attendees": 10, "required_equipments": []}
+
+
+def test_offset_dates_are_stored_as_local_time(client):
+    assert client.post("/rooms", json=ROOM).status_code == 201
+    response = client.post("/bookings", json=dict(BOOKING, start_date="2030-01-01T10:00:00Z",
+                                                   end_date="2030-01-01T11:00:00+00:00"))
+    assert response.status_code == 201
+    assert "+" not in response.json()["start_date"] and "Z" not in response.json()["start_date"]
+
+    for method, url, kwargs in [
+        ("post", "/waitlist", {"json": dict(BOOKING, start_date="2030-01-02T10:00:00Z",
+                                            end_date="2030-01-02T11:00:00Z")}),
+        ("post", "/holds", {"json": dict(BOOKING, start_date="2030-01-03T10:00:00+02:00",
+                                         end_date="2030-01-03T11:00:00+02:00")}),
+        ("post", "/availability/check", {"json": {
+            "event_name": "Event", "attendees": 10, "required_equipments": [],
+            "start_date": "2030-01-01T10:00:00Z", "end_date": "2030-01-01T11:00:00Z"}}),
+        ("get", "/schedules", {"params": {"start_date": "2030-01-01T00:00:00Z"}}),
+        ("get", "/rooms/1/availability", {"params": {"start_date": "2030-01-01T10:00:00Z",
+                                                     "end_date": "2030-01-01T11:00:00Z"}}),
+        ("post", "/archive", {"params": {"retention_days": 0}}),
+    ]:
+        response = getattr(client, method)(url, **kwargs)
+        assert response.status_code < 300, (url, response.text)
+
+    table = pa.ipc.open_stream(client.get("/export/bookings").content).read_all()
+    # The booking and the promoted waitlist entry
+    assert table.num_rows == 2
+
+
+def test_import_error_reports_the_rows_already_saved(client):
+    rows = "".join(f"Room {i},10,\n" for i in range(DEFAULT_CHUNK_SIZE + 1000))
+    content = b"name,capacity,equipments\n" + rows.encode() + b"\xff\xfe,10,\n"
+
+    response = client.post("/import/rooms", files={"file": ("rooms.csv", content)})
+
+    assert response.status_code == 400
+    report = response.json()
+    assert report["imported"] == DEFAULT_CHUNK_SIZE
+    assert "Invalid rooms file" in report["error"] and report["detail"] == report["error"]
+    assert len(client.get("/rooms").json()) == DEFAULT_CHUNK_SIZE
+
+
+def test_availability_check_ignores_the_callers_hold(client):
+    assert client.post("/rooms", json=ROOM).status_code == 201
+    period = {"start_date": "2030-01-01T10:00:00", "end_date": "2030-01-01T11:00:00"}
+    check = {"event_name": "Event", "attendees": 10, "required_equipments": [], **period}
+    hold_id = client.post("/holds", json=dict(BOOKING, **period)).json()["id"]
+
+    rooms = client.post("/availability/check", json=check).json()["rooms"]
+    assert rooms == []
+    rooms = client.post("/availability/check", params={"exclude_hold_id": hold_id},
+                        json=check).json()["rooms"]
+    assert [room["id"] for room in rooms] == [1]
@@ -0,0 +1,45 @@
+import sqlite3
+from datetime import timedelta
+
+import pytest
+
+from conftest import START
+
+
+def stored_ids(scheduler, table: str) -> list:
+    conn = sqlite3.connect(scheduler.db.db_path)
+    try:
+        return [row[0] for row in conn.execute(f'SELECT id FROM {table} ORDER BY id')]
+    finally:
+        conn.close()
+
+
+def book(scheduler, day: int):
+    start = START + timedelta(days=day)
+    return scheduler.create_booking(1, f"Day {day}", 5, [], start, start + timedelta(hours=1))
+
+
+def test_archive_moves_the_same_bookings_in_memory_and_database(scheduler):
+    old, older, recent = book(scheduler, 1), book(scheduler, 0), book(scheduler, 5)
+
+    assert scheduler.archive_bookings_before(START + timedelta(days=2)) == 2
+
+    assert stored_ids(scheduler, "archived_bookings") == sorted([old.id, older.id])
+    assert stored_ids(scheduler, "bookings") == [recent.id]
+    assert scheduler.bookings == [recent]
+    assert scheduler.archive_watermark == old.end_date
+    assert not scheduler.is_room_available(1, old.start_date, old.end_date)
+
+
+def test_failed_archive_leaves_memory_untouched(scheduler, monkeypatch):
+    booking = book(scheduler, 0)
+
+    def failing_archive(booking_ids):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(scheduler.db, "archive_bookings", failing_archive)
+    with pytest.raises(sqlite3.OperationalError):
+        scheduler.archive_bookings_before(START + timedelta(days=1))
+
+    assert scheduler.bookings == [booking]
+    assert scheduler.archive_watermark is None
@@ -0,0 +1,79 @@
+import threading
+import time
+from bisect import insort
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pytest
+
+from app.models import Room
+from app import scheduler as scheduler_module
+from app.scheduler import Scheduler
+from conftest import START
+
+
+class YieldingLock:
+    """Re-entrant lock letting other threads run right after each release."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        self._lock.acquire()
+
+    def __exit__(self, *exc_info):
+        self._lock.release()
+        time.sleep(0.0005)
+
+
+def test_parallel_bookings_of_one_slot_have_one_winner(scheduler, monkeypatch):
+    # Hand the lock over to waiting threads on every release, to hit any gap
+    # between two critical sections of the same booking
+    monkeypatch.setattr(scheduler, "lock", YieldingLock())
+    threads, attempts, slots = 8, 25, 20
+    for slot in range(slots):
+        start = START + timedelta(hours=slot)
+        barrier = threading.Barrier(threads)
+
+        def book(i):
+            # Keep retrying so some attempts land while the winner's write completes
+            barrier.wait()
+            return [scheduler.create_booking(1, f"Event {slot}-{i}", 10, [],
+                                             start, start + timedelta(hours=1))
+                    for _ in range(attempts)]
+
+        with ThreadPoolExecutor(threads) as executor:
+            results = [b for bookings in executor.map(book, range(threads)) for b in bookings]
+        assert sum(booking is not None for booking in results) == 1
+
+    assert len(scheduler.bookings) == slots
+    assert len(Scheduler(scheduler.db.db_path).bookings) == slots
+
+
+def test_failed_write_releases_the_slot(scheduler, monkeypatch):
+    def failing_write(event, booking):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(scheduler.writer, "write", failing_write)
+    with pytest.raises(RuntimeError):
+        scheduler.create_booking(1, "Lost", 10, [], START, START + timedelta(hours=1))
+    monkeypatch.undo()
+
+    assert scheduler.is_room_available(1, START, START + timedelta(hours=1))
+    assert scheduler.create_booking(1, "Kept", 10, [], START, START + timedelta(hours=1))
+
+
+def test_parallel_room_creation_indexes_every_room(scheduler, monkeypatch):
+    def yielding_insort(*args):
+        # Let other threads run between copying the capacity index and replacing it
+        time.sleep(0.0005)
+        insort(*args)
+
+    monkeypatch.setattr(scheduler_module, "insort", yielding_insort)
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda i: scheduler.add_room(Room(0, f"Room {i}", i % 40 + 1, [])),
+                          range(200)))
+
+    assert len(scheduler.rooms) == 201
+    assert sorted(room.id for _, _, room in scheduler.rooms_by_capacity) == \
+        sorted(room.id for room in scheduler.rooms)
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+import pytest
+
+from app.holds import RESOLVED_RETENTION_SECONDS, Hold, HoldTable
+from conftest import START
+
+END = START + timedelta(hours=1)
+
+
+def test_resolved_holds_are_forgotten_after_retention():
+    holds = HoldTable()
+    hold = holds.add(1, "Event", 5, [], START, END, ttl_seconds=60)
+    holds.remove(hold, Hold.CONFIRMED, booking_id=7)
+
+    for _ in range(RESOLVED_RETENTION_SECONDS - 1):
+        assert holds.advance() == []
+    assert holds.get(hold.id).booking_id == 7
+    holds.advance()
+    assert holds.get(hold.id) is None
+    assert len(holds.wheel) == 0
+
+
+def test_expired_holds_are_forgotten_after_retention():
+    holds = HoldTable()
+    hold = holds.add(1, "Event", 5, [], START, END, ttl_seconds=2)
+
+    assert holds.advance() == []
+    assert holds.advance() == [hold]
+    assert hold.status == Hold.EXPIRED
+    for _ in range(RESOLVED_RETENTION_SECONDS):
+        holds.advance()
+    assert holds.get(hold.id) is None
+
+
+def test_failed_write_keeps_the_hold(scheduler, monkeypatch):
+    hold = scheduler.place_hold(1, "Event", 5, [], START, END, ttl_seconds=60)
+
+    def failing_write(event, booking):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(scheduler.writer, "write", failing_write)
+    with pytest.raises(RuntimeError):
+        scheduler.confirm_hold(hold.id)
+    monkeypatch.undo()
+
+    assert hold.is_active()
+    assert not scheduler.is_room_available(1, START, END)
+    booking = scheduler.confirm_hold(hold.id)
+    assert booking and hold.status == Hold.CONFIRMED and hold.booking_id == booking.id
@@ -0,0 +1,37 @@
+import io
+from datetime import datetime, timezone
+
+from app.importer import import_bookings, read_chunks
+
+
+def csv_chunks(text: str, chunk_size: int = 2):
+    return read_chunks(io.BytesIO(text.encode()), "csv", chunk_size)
+
+
+def test_offset_dates_are_stored_as_local_time(scheduler):
+    report = import_bookings(scheduler, csv_chunks(
+        "room_id,event_name,attendees,start_date,end_date\n"
+        "1,Offset,5,2030-01-01T10:30+00:00,2030-01-01T11:30+00:00\n"
+        "1,Naive,5,2031-01-01T10:30,2031-01-01T11:30\n"
+    ))
+    assert report.to_dict()["imported"] == 2
+
+    start = datetime(2030, 1, 1, 10, 30, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    booking = scheduler.bookings[0]
+    assert booking.start_date.tzinfo is None
+    assert booking.start_date == start
+    # Comparing with the naive dates of other requests must not fail
+    assert not scheduler.is_room_available(1, start, datetime(2030, 1, 2))
+    assert scheduler.check_room_availability(1, datetime(2031, 1, 1), datetime(2031, 1, 2)) is False
+
+
+def test_rejects_are_reported_per_row_in_order(scheduler):
+    report = import_bookings(scheduler, csv_chunks(
+        "room_id,event_name,attendees,start_date,end_date\n"
+        "1,Ok,5,2030-01-01T10:00,2030-01-01T11:00\n"
+        "1,Clash,5,2030-01-01T10:30,2030-01-01T11:30\n"
+        "1,Bad date,5,tomorrow,2030-01-01T11:30\n"
+        "9,No room,5,2030-01-01T10:00,2030-01-01T11:00\n"
+    )).to_dict()
+    assert report["imported"] == 1
+    assert [reject["row"] for reject in report["rejects"]] == [2, 3, 4]
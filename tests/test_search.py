@@ -0,0 +1,32 @@
+from app.database import Database
+from app.models import Room
+from app.search import SearchIndex
+from app.sharding import SHARD_ID_SPAN, shard_db_path, split_database
+
+
+def test_name_ranking_merges_shards_into_the_unsharded_order(tmp_path):
+    db_path = str(tmp_path / "booking_system.db")
+    database = Database(db_path)
+    names = [("Lab", "north"), ("Lab annex", "south"), ("Lab annex", "north"),
+             ("Big lab", "south"), ("Labyrinth", "north"), ("Meeting", "south")]
+    database.save_rooms([Room(0, name, 10, ["Lab kit"] if name == "Meeting" else [], site)
+                         for name, site in names])
+    expected = database.search("lab", limit=100, ranking="name")
+    assert [r["name"] for r in expected] == \
+        ["Lab", "Lab annex", "Lab annex", "Labyrinth", "Big lab", "Meeting"]
+
+    # Rooms keep their rank but take their shard's global ID, which breaks ties
+    site_of = {i + 1: site for i, (_, site) in enumerate(names)}
+    for result in expected:
+        result["id"] += SHARD_ID_SPAN * (site_of[result["id"]] == "south")
+    expected.sort(key=SearchIndex.sort_key)
+
+    split_database(db_path, ["north", "south"])
+    for limit, offset in [(100, 0), (2, 1), (3, 3)]:
+        merged = []
+        for site in ("north", "south"):
+            merged += Database(shard_db_path(db_path, site)).search(
+                "lab", limit=limit + offset, ranking="name")
+        merged.sort(key=SearchIndex.sort_key)
+        assert [(r["name"], r["id"]) for r in merged[offset:offset + limit]] == \
+            [(r["name"], r["id"]) for r in expected[offset:offset + limit]]
@@ -0,0 +1,55 @@
+import sqlite3
+from datetime import timedelta
+
+import pytest
+
+from app.models import Room
+from app.scheduler import Scheduler
+from app.sharding import SHARD_ID_SPAN, shard_db_path, split_database, stored_rows
+from conftest import START
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    db_path = str(tmp_path / "booking_system.db")
+    scheduler = Scheduler(db_path)
+    scheduler.add_room(Room(0, "North A", 10, [], "north"))
+    scheduler.add_room(Room(0, "South B", 10, [], "south"))
+    for room_id in (1, 2):
+        scheduler.create_booking(room_id, f"Event {room_id}", 5, [], START,
+                                 START + timedelta(hours=1))
+    scheduler.writer.close()
+    return db_path
+
+
+def rows(db_path: str, table: str) -> list:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f'SELECT * FROM {table} ORDER BY id').fetchall()
+    finally:
+        conn.close()
+
+
+def test_split_moves_rows_to_their_site_with_shifted_ids(db_path):
+    assert split_database(db_path, ["north", "south"]) == {"north": 1, "south": 1}
+
+    assert stored_rows(db_path) == 0
+    north, south = shard_db_path(db_path, "north"), shard_db_path(db_path, "south")
+    assert rows(north, "bookings") == [(1, 1, 1, START.isoformat(),
+                                        (START + timedelta(hours=1)).isoformat())]
+    assert [row[:3] for row in rows(south, "bookings")] == \
+        [(SHARD_ID_SPAN + 2, SHARD_ID_SPAN + 2, SHARD_ID_SPAN + 2)]
+    assert [row[1] for row in rows(south, "events")] == ["Event 2"]
+
+    # New rows keep allocating from each shard's own range
+    scheduler = Scheduler(south, SHARD_ID_SPAN)
+    booking = scheduler.create_booking(SHARD_ID_SPAN + 2, "Later", 5, [],
+                                       START + timedelta(hours=1), START + timedelta(hours=2))
+    assert booking.id == SHARD_ID_SPAN + 3
+
+
+def test_split_refuses_unknown_sites(db_path):
+    with pytest.raises(ValueError):
+        split_database(db_path, ["north"])
+    assert stored_rows(db_path) == 4
+    assert stored_rows(shard_db_path(db_path, "north")) == 0
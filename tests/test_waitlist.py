@@ -0,0 +1,86 @@
+import time
+from datetime import datetime, timedelta
+
+from app.waitlist import RESOLVED_RETENTION_SECONDS, Waitlist, WaitlistEntry
+from conftest import START
+
+
+def add(waitlist: Waitlist, start_in: float) -> WaitlistEntry:
+    start = datetime.now() + timedelta(seconds=start_in)
+    return waitlist.add(1, "Event", 5, [], start, start + timedelta(hours=1))
+
+
+def test_entries_expire_when_their_start_passes():
+    waitlist = Waitlist()
+    soon, later = add(waitlist, 1.5), add(waitlist, 3600)
+
+    assert waitlist.advance() == []
+    assert waitlist.advance() == [soon]
+    assert soon.status == WaitlistEntry.EXPIRED
+    assert later.status == WaitlistEntry.WAITING
+    assert waitlist.room_entries(1) == [later]
+
+
+def test_resolved_entries_are_forgotten_after_retention():
+    waitlist = Waitlist()
+    entry = add(waitlist, 3600)
+    waitlist.remove(entry, WaitlistEntry.CANCELLED)
+
+    for _ in range(RESOLVED_RETENTION_SECONDS - 1):
+        waitlist.advance()
+    assert waitlist.get(entry.id) is entry
+    waitlist.advance()
+    assert waitlist.get(entry.id) is None
+    assert len(waitlist.wheel) == 0
+
+
+def hours(start: int, end: int):
+    return START + timedelta(hours=start), START + timedelta(hours=end)
+
+
+def test_cancellation_promotes_the_first_fitting_entry(scheduler):
+    booking = scheduler.create_booking(1, "Booked", 5, [], *hours(0, 2))
+    scheduler.create_booking(1, "Kept", 5, [], *hours(2, 3))
+    blocked = scheduler.join_waitlist(1, "Still blocked", 5, [], *hours(1, 3))
+    first = scheduler.join_waitlist(1, "First", 5, [], *hours(0, 1))
+    second = scheduler.join_waitlist(1, "Second", 5, [], *hours(0, 2))
+
+    assert scheduler.cancel_booking(booking.id)
+
+    assert blocked.status == WaitlistEntry.WAITING
+    assert first.status == WaitlistEntry.PROMOTED
+    assert scheduler.get_booking(first.booking_id).start_date == START
+    assert second.status == WaitlistEntry.WAITING
+
+
+def test_released_hold_promotes_the_waiting_entry(scheduler):
+    hold = scheduler.place_hold(1, "Held", 5, [], *hours(0, 1))
+    entry = scheduler.join_waitlist(1, "Waiting", 5, [], *hours(0, 1))
+    assert entry.status == WaitlistEntry.WAITING
+
+    assert scheduler.release_hold(hold.id)
+    assert entry.status == WaitlistEntry.PROMOTED
+
+
+def test_expired_hold_promotes_the_waiting_entry(scheduler):
+    scheduler.place_hold(1, "Held", 5, [], *hours(0, 1), ttl_seconds=1)
+    entry = scheduler.join_waitlist(1, "Waiting", 5, [], *hours(0, 1))
+
+    deadline = time.monotonic() + 5
+    while entry.status == WaitlistEntry.WAITING and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert entry.status == WaitlistEntry.PROMOTED
+
+
+def test_failed_promotion_keeps_the_entry_waiting(scheduler, monkeypatch):
+    booking = scheduler.create_booking(1, "Booked", 5, [], *hours(0, 1))
+    entry = scheduler.join_waitlist(1, "Waiting", 5, [], *hours(0, 1))
+
+    def failing_write(event, booking):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(scheduler.writer, "write", failing_write)
+    assert scheduler.cancel_booking(booking.id)
+    assert entry.status == WaitlistEntry.WAITING
+    assert scheduler.get_room_waitlist(1) == [entry]
+    assert scheduler.leave_waitlist(entry.id)